@@ -4,6 +4,7 @@ Debug script to investigate metadata extraction from real CSV files
 """
 
 import pandas as pd
+import logging
 import sys
 import os
 
@@ -193,4 +194,6 @@ def main():
     debug_metadata_extraction()
 
 if __name__ == "__main__":
+    # Show the processor's metadata extraction trace
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     main() 
\ No newline at end of file
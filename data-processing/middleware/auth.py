@@ -237,4 +237,22 @@ async def heavy_rate_limit(request: Request, current_user: Optional[Dict[str, An
 
 async def comparison_rate_limit(request: Request, current_user: Optional[Dict[str, Any]] = Depends(get_current_user_optional)) -> None:
     """Comparison operation rate limit: 20 requests per hour"""
-    await check_rate_limit(request, 20, 3600, current_user)
\ No newline at end of file
+    await check_rate_limit(request, 20, 3600, current_user)
+
+# Authenticated rate limit presets. The user is verified once and that identity
+# keys the limiter; pairing get_current_user with a preset above resolves the
+# token a second time through get_current_user_optional.
+async def basic_auth_and_rate(request: Request, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    """Authenticated user with basic rate limit: 100 requests per hour"""
+    await check_rate_limit(request, 100, 3600, current_user)
+    return current_user
+
+async def heavy_auth_and_rate(request: Request, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    """Authenticated user with heavy operation rate limit: 10 requests per hour"""
+    await check_rate_limit(request, 10, 3600, current_user)
+    return current_user
+
+async def comparison_auth_and_rate(request: Request, current_user: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    """Authenticated user with comparison operation rate limit: 20 requests per hour"""
+    await check_rate_limit(request, 20, 3600, current_user)
+    return current_user
\ No newline at end of file
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+import numpy as np
+from pydantic import BaseModel, PrivateAttr
+from typing import Optional, List, Dict, Any, Tuple
 
 class HealthResponse(BaseModel):
     status: str
@@ -13,6 +14,7 @@ class ProcessingResult(BaseModel):
     rows_processed: Optional[int] = None
     fastest_lap_time: Optional[float] = None
     metadata: Optional[Dict[str, Any]] = None
+    session_data: Optional["SessionData"] = None
 
 class FileAnalysis(BaseModel):
     filename: str
@@ -50,6 +52,28 @@ class LapData(BaseModel):
     lap_time: float
     data_points: List[TelemetryDataPoint]
     is_fastest: bool = False
+    
+    # field -> (data_points list the array was built from, channel array)
+    _channels: Dict[str, Tuple[List[TelemetryDataPoint], np.ndarray]] = PrivateAttr(default_factory=dict)
+    
+    def channel(self, field: str) -> np.ndarray:
+        """
+        One TelemetryDataPoint field across the lap as a float64 array, NaN where
+        a point has no value
+        
+        The array is built on first use and shared by later analyses of the lap
+        (it is read-only); it is rebuilt if data_points has been replaced.
+        """
+        cached = self._channels.get(field)
+        if cached is not None and cached[0] is self.data_points and len(cached[1]) == len(self.data_points):
+            return cached[1]
+        
+        values = (getattr(point, field) for point in self.data_points)
+        array = np.fromiter((np.nan if value is None else value for value in values),
+                            dtype=np.float64, count=len(self.data_points))
+        array.flags.writeable = False
+        self._channels[field] = (self.data_points, array)
+        return array
 
 class SessionData(BaseModel):
     driver_name: Optional[str] = None
@@ -57,4 +81,7 @@ class SessionData(BaseModel):
     track_name: Optional[str] = None
     laps: List[LapData] = []
     fastest_lap: Optional[LapData] = None
-    metadata: Dict[str, Any] = {} 
\ No newline at end of file
+    metadata: Dict[str, Any] = {}
+
+# ProcessingResult refers to SessionData before it is defined
+ProcessingResult.model_rebuild()
@@ -6,7 +6,7 @@ import numpy as np
 from services.database import get_database_manager, SessionRepository, CacheManager, DatabaseManager
 from services.data_processor import TelemetryProcessor
 from models.telemetry_models import SessionData
-from middleware.auth import get_current_user, comparison_rate_limit, basic_rate_limit
+from middleware.auth import basic_auth_and_rate, comparison_auth_and_rate
 
 router = APIRouter(prefix="/comparison", tags=["advanced-comparison"])
 logger = logging.getLogger(__name__)
@@ -34,8 +34,7 @@ async def perform_advanced_session_comparison(
     include_detailed_points: bool = Form(False, description="Include detailed comparison points"),
     session_repo: SessionRepository = Depends(get_session_repo),
     cache_manager: CacheManager = Depends(get_cache_manager),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    _: None = Depends(comparison_rate_limit)
+    current_user: Dict[str, Any] = Depends(comparison_auth_and_rate)
 ):
     """
     Perform advanced comparison analysis between two stored sessions
@@ -120,8 +119,7 @@ async def get_session_performance_metrics(
     lap_number: Optional[int] = Query(None, description="Specific lap number (uses fastest if not provided)"),
     session_repo: SessionRepository = Depends(get_session_repo),
     cache_manager: CacheManager = Depends(get_cache_manager),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    _: None = Depends(basic_rate_limit)
+    current_user: Dict[str, Any] = Depends(basic_auth_and_rate)
 ):
     """
     Get detailed performance metrics for a specific session
@@ -192,8 +190,7 @@ async def compare_drivers_across_sessions(
     session_repo: SessionRepository = Depends(get_session_repo),
     cache_manager: CacheManager = Depends(get_cache_manager),
     db_manager: DatabaseManager = Depends(get_db_manager),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    _: None = Depends(comparison_rate_limit)
+    current_user: Dict[str, Any] = Depends(comparison_auth_and_rate)
 ):
     """
     Compare two drivers across multiple sessions
@@ -346,8 +343,7 @@ async def compare_drivers_across_sessions(
 
 @router.get("/comparison-capabilities")
 async def get_comparison_capabilities(
-    current_user: Optional[Dict[str, Any]] = Depends(get_current_user),
-    _: None = Depends(basic_rate_limit)
+    current_user: Optional[Dict[str, Any]] = Depends(basic_auth_and_rate)
 ):
     """
     Get available comparison engine capabilities and features
@@ -8,7 +8,7 @@ from services.database import get_database_manager, SessionRepository, CacheMana
 from services.data_processor import TelemetryProcessor
 from models.telemetry_models import SessionData, ProcessingResult, AnalysisResult
 from models.database_models import Session as DBSession, Driver, Track, ComparisonResult, ProcessingJob
-from middleware.auth import get_current_user, get_current_user_optional, basic_rate_limit, heavy_rate_limit, comparison_rate_limit
+from middleware.auth import get_current_user_optional, basic_rate_limit, heavy_auth_and_rate, comparison_auth_and_rate
 
 router = APIRouter(prefix="/data", tags=["data-management"])
 
@@ -35,8 +35,7 @@ async def upload_and_store_session(
     track_name: Optional[str] = Form(None),
     session_repo: SessionRepository = Depends(get_session_repo),
     cache_manager: CacheManager = Depends(get_cache_manager),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    _: None = Depends(heavy_rate_limit)
+    current_user: Dict[str, Any] = Depends(heavy_auth_and_rate)
 ):
     """
     Upload CSV telemetry file and store processed data in database
@@ -85,9 +84,11 @@ async def upload_and_store_session(
         # Store in database
         session_id = session_repo.create_session_from_data(session_data, file_info)
         
-        # Cache the session data
+        # Cache the session data (without telemetry points, as for session details)
         cache_key = cache_manager.get_session_cache_key(session_id)
-        cache_manager.set(cache_key, session_data.dict())
+        cache_manager.set(cache_key, session_data.model_dump(
+            exclude={'laps': {'__all__': {'data_points'}}, 'fastest_lap': {'data_points'}}
+        ))
         
         return {
             "success": True,
@@ -237,8 +238,7 @@ async def compare_stored_sessions(
     session_repo: SessionRepository = Depends(get_session_repo),
     cache_manager: CacheManager = Depends(get_cache_manager),
     db_manager: DatabaseManager = Depends(get_db_manager),
-    current_user: Dict[str, Any] = Depends(get_current_user),
-    _: None = Depends(comparison_rate_limit)
+    current_user: Dict[str, Any] = Depends(comparison_auth_and_rate)
 ):
     """
     Compare two stored sessions with caching and database persistence
@@ -1,9 +1,12 @@
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any, Union, Final
 from dataclasses import dataclass
 from enum import Enum
+from collections import OrderedDict
 import logging
+import threading
+import time
 from datetime import datetime
 
 from models.telemetry_models import SessionData, LapData, TelemetryDataPoint
@@ -11,6 +14,18 @@ from services.data_alignment import DataAlignmentEngine
 
 logger = logging.getLogger(__name__)
 
+# Default classification thresholds. The action thresholds are exactly representable
+# in float32, so float32 channels can be compared against them without upcasting.
+FULL_THROTTLE_THRESHOLD: Final = 95.0  # %
+PARTIAL_THROTTLE_THRESHOLD: Final = 10.0  # %
+BRAKING_THRESHOLD: Final = 5.0  # %
+TRAIL_BRAKING_THRESHOLD: Final = 15.0  # % throttle while braking
+COASTING_THRESHOLD: Final = 5.0  # % for both throttle and brake
+
+NEUTRAL_DYNAMICS_THRESHOLD: Final = 0.1  # g-force
+SEVERE_DYNAMICS_THRESHOLD: Final = 0.3  # g-force
+CORRECTION_STEERING_RATE: Final = 10.0  # degrees/second steering rate
+
 class DriverAction(Enum):
     """Driver action classification"""
     FULL_THROTTLE = "full_throttle"
@@ -19,6 +34,33 @@ class DriverAction(Enum):
     BRAKING = "braking"
     TRAIL_BRAKING = "trail_braking"
 
+# int8 codes used by the vectorised action classifier; _ACTIONS_BY_CODE maps them
+# back to DriverAction at the API boundary
+ACTION_FULL_THROTTLE = 0
+ACTION_PARTIAL_THROTTLE = 1
+ACTION_COASTING = 2
+ACTION_BRAKING = 3
+ACTION_TRAIL_BRAKING = 4
+
+_ACTIONS_BY_CODE = (
+    DriverAction.FULL_THROTTLE,
+    DriverAction.PARTIAL_THROTTLE,
+    DriverAction.COASTING,
+    DriverAction.BRAKING,
+    DriverAction.TRAIL_BRAKING,
+)
+
+def _distribution_from_counts(counts: np.ndarray) -> Dict[DriverAction, float]:
+    """Convert per-code action counts into a DriverAction -> percentage mapping"""
+    total = counts.sum()
+    if not total:
+        return dict.fromkeys(_ACTIONS_BY_CODE, 0.0)
+    return dict(zip(_ACTIONS_BY_CODE, (counts * (100.0 / total)).tolist()))
+
+def _action_percentages(codes: np.ndarray) -> Dict[DriverAction, float]:
+    """Action distribution of an int8 code array in a single bincount pass"""
+    return _distribution_from_counts(np.bincount(codes, minlength=len(_ACTIONS_BY_CODE)))
+
 class VehicleDynamics(Enum):
     """Vehicle dynamics classification"""
     NEUTRAL = "neutral"
@@ -26,7 +68,20 @@ class VehicleDynamics(Enum):
     UNDERSTEER = "understeer"
     CORRECTION = "correction"
 
-@dataclass
+# int8 codes for vectorised dynamics classification, in VehicleDynamics order
+DYNAMICS_NEUTRAL = 0
+DYNAMICS_OVERSTEER = 1
+DYNAMICS_UNDERSTEER = 2
+DYNAMICS_CORRECTION = 3
+
+_DYNAMICS_BY_CODE = (
+    VehicleDynamics.NEUTRAL,
+    VehicleDynamics.OVERSTEER,
+    VehicleDynamics.UNDERSTEER,
+    VehicleDynamics.CORRECTION,
+)
+
+@dataclass(slots=True, frozen=True)
 class ComparisonPoint:
     """Single point in comparison analysis"""
     distance: float
@@ -51,7 +106,62 @@ class ComparisonPoint:
     driver2_action: DriverAction
     driver2_dynamics: VehicleDynamics
 
-@dataclass
+@dataclass(slots=True)
+class ComparisonPoints:
+    """
+    Struct-of-arrays view of the per-point comparison data
+    
+    Every field is an ndarray with one entry per aligned distance sample. Distance
+    and time deltas are float64, telemetry channels float32 and actions int8
+    ACTION_* codes. Indexing or iterating materialises ComparisonPoint
+    objects on demand for callers that still work row by row.
+    """
+    distance: np.ndarray
+    time_delta: np.ndarray
+    speed_delta: np.ndarray
+    throttle_delta: np.ndarray
+    brake_delta: np.ndarray
+    gear_delta: np.ndarray
+    rpm_delta: np.ndarray
+    
+    driver1_speed: np.ndarray
+    driver1_throttle: np.ndarray
+    driver1_brake: np.ndarray
+    driver1_action: np.ndarray
+    
+    driver2_speed: np.ndarray
+    driver2_throttle: np.ndarray
+    driver2_brake: np.ndarray
+    driver2_action: np.ndarray
+    
+    def __len__(self) -> int:
+        return len(self.distance)
+    
+    def __getitem__(self, index: int) -> ComparisonPoint:
+        return ComparisonPoint(
+            distance=self.distance[index].item(),
+            time_delta=self.time_delta[index].item(),
+            speed_delta=self.speed_delta[index].item(),
+            throttle_delta=self.throttle_delta[index].item(),
+            brake_delta=self.brake_delta[index].item(),
+            gear_delta=self.gear_delta[index].item(),
+            rpm_delta=self.rpm_delta[index].item(),
+            driver1_speed=self.driver1_speed[index].item(),
+            driver1_throttle=self.driver1_throttle[index].item(),
+            driver1_brake=self.driver1_brake[index].item(),
+            driver1_action=_ACTIONS_BY_CODE[self.driver1_action[index]],
+            driver1_dynamics=VehicleDynamics.NEUTRAL,
+            driver2_speed=self.driver2_speed[index].item(),
+            driver2_throttle=self.driver2_throttle[index].item(),
+            driver2_brake=self.driver2_brake[index].item(),
+            driver2_action=_ACTIONS_BY_CODE[self.driver2_action[index]],
+            driver2_dynamics=VehicleDynamics.NEUTRAL
+        )
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+@dataclass(slots=True, frozen=True)
 class SectorAnalysis:
     """Analysis results for a track sector"""
     sector_number: int
@@ -77,7 +187,7 @@ class SectorAnalysis:
     # Action analysis
     action_distribution: Dict[str, Dict[DriverAction, float]]  # driver -> action -> percentage
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ComparisonResult:
     """Complete comparison analysis result"""
     driver1_name: str
@@ -91,8 +201,8 @@ class ComparisonResult:
     total_distance: float
     data_points: int
     
-    # Detailed analysis
-    comparison_points: List[ComparisonPoint]
+    # Detailed analysis; per-point objects only when materialize_points was requested
+    comparison_points: Union[ComparisonPoints, List[ComparisonPoint]]
     sector_analysis: List[SectorAnalysis]
     
     # Performance summaries
@@ -109,11 +219,11 @@ class DriverActionClassifier:
     
     def __init__(self):
         # Configurable thresholds
-        self.full_throttle_threshold = 95.0  # %
-        self.partial_throttle_threshold = 10.0  # %
-        self.braking_threshold = 5.0  # %
-        self.trail_braking_threshold = 15.0  # % throttle while braking
-        self.coasting_threshold = 5.0  # % for both throttle and brake
+        self.full_throttle_threshold = FULL_THROTTLE_THRESHOLD
+        self.partial_throttle_threshold = PARTIAL_THROTTLE_THRESHOLD
+        self.braking_threshold = BRAKING_THRESHOLD
+        self.trail_braking_threshold = TRAIL_BRAKING_THRESHOLD
+        self.coasting_threshold = COASTING_THRESHOLD
     
     def classify_action(self, throttle: float, brake: float) -> DriverAction:
         """Classify driver action at a single point"""
@@ -135,28 +245,67 @@ class DriverActionClassifier:
         # Default to partial throttle
         return DriverAction.PARTIAL_THROTTLE
     
-    def analyze_action_sequence(self, throttle_data: List[float], 
-                              brake_data: List[float]) -> Dict[str, Any]:
-        """Analyze sequence of driver actions"""
-        actions = [self.classify_action(t, b) for t, b in zip(throttle_data, brake_data)]
+    def classify_actions_vec(self, throttle: np.ndarray, brake: np.ndarray) -> np.ndarray:
+        """
+        Classify driver actions for whole channels at once.
+        
+        Applies the same rules as classify_action and returns int8 ACTION_* codes;
+        later writes take precedence, mirroring the order of the scalar checks.
+        Codes are built arithmetically from the comparison masks and merged with
+        np.copyto, avoiding the scattered writes of boolean-index assignment.
+        """
+        # Float channels (e.g. the float32 comparison arrays) are compared as-is
+        throttle = np.asarray(throttle)
+        brake = np.asarray(brake)
+        if throttle.dtype.kind != 'f':
+            throttle = throttle.astype(float)
+        if brake.dtype.kind != 'f':
+            brake = brake.astype(float)
+        
+        coasting = (throttle <= self.coasting_threshold) & (brake <= self.coasting_threshold)
+        trail = (throttle >= self.trail_braking_threshold).view(np.int8)
+        
+        # PARTIAL_THROTTLE + 1 == COASTING and BRAKING + 1 == TRAIL_BRAKING
+        codes = np.full(throttle.shape, ACTION_PARTIAL_THROTTLE, dtype=np.int8)
+        codes += coasting
+        np.copyto(codes, np.int8(ACTION_BRAKING) + trail, where=brake >= self.braking_threshold)
+        np.copyto(codes, np.int8(ACTION_FULL_THROTTLE), where=throttle >= self.full_throttle_threshold)
+        return codes
+    
+    def analyze_action_sequence(self, throttle_data: Optional[List[float]] = None, 
+                              brake_data: Optional[List[float]] = None,
+                              codes: Optional[np.ndarray] = None) -> Dict[str, Any]:
+        """
+        Analyze sequence of driver actions
+        
+        Pass either throttle/brake data to classify, or precomputed ACTION_* codes
+        (e.g. ComparisonPoints.driver1_action) to skip classification.
+        """
+        if codes is None:
+            # Channels are paired point by point as zip() would, so the shorter
+            # one sets the length (callers may drop missing samples per channel)
+            throttle_data = np.asarray(throttle_data)
+            brake_data = np.asarray(brake_data)
+            n_points = min(len(throttle_data), len(brake_data))
+            codes = self.classify_actions_vec(throttle_data[:n_points], brake_data[:n_points])
         
         # Calculate action distribution
-        action_counts = {action: actions.count(action) for action in DriverAction}
-        total_points = len(actions)
-        action_percentages = {
-            action: (count / total_points) * 100 
-            for action, count in action_counts.items()
-        }
-        
-        # Find action transitions
-        transitions = []
-        for i in range(1, len(actions)):
-            if actions[i] != actions[i-1]:
-                transitions.append({
-                    'point': i,
-                    'from': actions[i-1],
-                    'to': actions[i]
-                })
+        action_percentages = _action_percentages(codes)
+        
+        # Find action transitions; only the change points are materialised
+        transition_points = np.flatnonzero(np.diff(codes)) + 1
+        transitions = [
+            {
+                'point': point,
+                'from': _ACTIONS_BY_CODE[from_code],
+                'to': _ACTIONS_BY_CODE[to_code]
+            }
+            for point, from_code, to_code in zip(
+                transition_points.tolist(),
+                codes[transition_points - 1].tolist(),
+                codes[transition_points].tolist()
+            )
+        ]
         
         return {
             'action_distribution': action_percentages,
@@ -170,9 +319,9 @@ class VehicleDynamicsAnalyzer:
     
     def __init__(self):
         # Thresholds for dynamics classification
-        self.neutral_threshold = 0.1  # g-force
-        self.severe_threshold = 0.3  # g-force
-        self.correction_threshold = 10.0  # degrees/second steering rate
+        self.neutral_threshold = NEUTRAL_DYNAMICS_THRESHOLD
+        self.severe_threshold = SEVERE_DYNAMICS_THRESHOLD
+        self.correction_threshold = CORRECTION_STEERING_RATE
     
     def classify_dynamics(self, lateral_accel: float, steering_angle: float, 
                          speed: float, steering_rate: Optional[float] = None) -> VehicleDynamics:
@@ -206,45 +355,81 @@ class VehicleDynamicsAnalyzer:
         
         return VehicleDynamics.NEUTRAL
     
+    def classify_dynamics_vec(self, lateral_accel: np.ndarray, steering_angle: np.ndarray,
+                              speed: np.ndarray, steering_rate: np.ndarray) -> np.ndarray:
+        """
+        Classify vehicle dynamics for whole channels at once.
+        
+        Applies the same rules as classify_dynamics and returns int8 DYNAMICS_* codes;
+        a NaN steering rate means no rate is available for that point. Inputs are
+        float arrays of equal length.
+        """
+        # Simplified expected lateral acceleration, as in classify_dynamics, built in
+        # one buffer rather than a chain of temporaries
+        lateral_error = np.multiply(speed, speed)
+        lateral_error *= np.abs(steering_angle)
+        lateral_error /= 1000
+        np.subtract(np.abs(lateral_accel), lateral_error, out=lateral_error)
+        
+        # Lowest-priority outcome first; later writes win, mirroring the scalar checks
+        codes = np.full(lateral_error.shape, DYNAMICS_OVERSTEER, dtype=np.int8)
+        np.copyto(codes, np.int8(DYNAMICS_UNDERSTEER), where=lateral_error > self.neutral_threshold)
+        
+        neutral = np.abs(lateral_error, out=lateral_error) < self.neutral_threshold
+        neutral |= steering_angle == 0
+        neutral |= ~(speed > 0)
+        neutral |= speed < 50
+        np.copyto(codes, np.int8(DYNAMICS_NEUTRAL), where=neutral)
+        
+        np.copyto(codes, np.int8(DYNAMICS_CORRECTION), where=np.abs(steering_rate) > self.correction_threshold)
+        return codes
+    
     def analyze_handling_characteristics(self, telemetry_points: List[TelemetryDataPoint]) -> Dict[str, Any]:
         """Analyze overall handling characteristics"""
         if not telemetry_points:
             return {}
         
-        dynamics_counts = {dynamics: 0 for dynamics in VehicleDynamics}
-        oversteer_events = []
-        understeer_events = []
-        
-        for i, point in enumerate(telemetry_points):
-            # Calculate steering rate if possible
-            steering_rate = None
-            if i > 0 and hasattr(point, 'steering_angle') and hasattr(telemetry_points[i-1], 'steering_angle'):
-                time_delta = point.time - telemetry_points[i-1].time
-                if time_delta > 0:
-                    steering_rate = (point.steering_angle - telemetry_points[i-1].steering_angle) / time_delta
-            
-            # Classify dynamics (using available data)
-            lateral_accel = getattr(point, 'lateral_acceleration', 0.0)
-            steering_angle = getattr(point, 'steering_angle', 0.0)
-            
-            dynamics = self.classify_dynamics(
-                lateral_accel, steering_angle, point.speed or 0, steering_rate
-            )
-            dynamics_counts[dynamics] += 1
-            
-            # Record significant events
-            if dynamics == VehicleDynamics.OVERSTEER:
-                oversteer_events.append({
-                    'time': point.time,
-                    'speed': point.speed,
-                    'lateral_accel': lateral_accel
-                })
-            elif dynamics == VehicleDynamics.UNDERSTEER:
-                understeer_events.append({
-                    'time': point.time,
-                    'speed': point.speed,
-                    'lateral_accel': lateral_accel
-                })
+        # Extract channels once; points without steering data contribute 0.0
+        # like the scalar path, and get no steering rate
+        time_values = np.fromiter((point.time for point in telemetry_points), dtype=float)
+        speed = np.fromiter((point.speed or 0 for point in telemetry_points), dtype=float)
+        lateral_accel = np.fromiter(
+            (getattr(point, 'lateral_acceleration', 0.0) for point in telemetry_points), dtype=float
+        )
+        steering_angle = np.fromiter(
+            (getattr(point, 'steering_angle', 0.0) for point in telemetry_points), dtype=float
+        )
+        has_steering = np.fromiter(
+            (hasattr(point, 'steering_angle') for point in telemetry_points), dtype=bool
+        )
+        
+        # Steering rate between consecutive points; NaN where it cannot be computed
+        time_delta = np.diff(time_values)
+        steering_rate = np.full(speed.shape, np.nan)
+        np.divide(
+            np.diff(steering_angle), time_delta, out=steering_rate[1:],
+            where=(time_delta > 0) & has_steering[1:] & has_steering[:-1]
+        )
+        
+        codes = self.classify_dynamics_vec(lateral_accel, steering_angle, speed, steering_rate)
+        dynamics_counts = dict(zip(
+            _DYNAMICS_BY_CODE, np.bincount(codes, minlength=len(_DYNAMICS_BY_CODE)).tolist()
+        ))
+        
+        # Record significant events
+        def events(code: int) -> List[Dict[str, Any]]:
+            indices = np.flatnonzero(codes == code)
+            return [
+                {
+                    'time': telemetry_points[i].time,
+                    'speed': telemetry_points[i].speed,
+                    'lateral_accel': accel
+                }
+                for i, accel in zip(indices.tolist(), lateral_accel[indices].tolist())
+            ]
+        
+        oversteer_events = events(DYNAMICS_OVERSTEER)
+        understeer_events = events(DYNAMICS_UNDERSTEER)
         
         total_points = len(telemetry_points)
         dynamics_percentages = {
@@ -275,12 +460,49 @@ class VehicleDynamicsAnalyzer:
         else:
             return "understeer_tendency"
 
+class _BufferPool:
+    """
+    Thread-safe pool of scratch arrays keyed by shape and dtype
+    
+    Batch comparisons of laps from the same sessions hit the same few lengths,
+    so scratch arrays are reused instead of reallocated per comparison. Only the
+    most recently used shapes are kept, with a few buffers each.
+    """
+    
+    def __init__(self, max_shapes: int = 8, max_per_shape: int = 4):
+        self.max_shapes = max_shapes
+        self.max_per_shape = max_per_shape
+        self._free: "OrderedDict[Tuple[Tuple[int, ...], str], List[np.ndarray]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def acquire(self, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        """Get an uninitialised array, reusing a released one when available"""
+        key = (shape, np.dtype(dtype).str)
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                return free.pop()
+        return np.empty(shape, dtype=dtype)
+    
+    def release(self, *buffers: np.ndarray) -> None:
+        """Return arrays to the pool; callers must not use them afterwards"""
+        with self._lock:
+            for buffer in buffers:
+                key = (buffer.shape, buffer.dtype.str)
+                free = self._free.setdefault(key, [])
+                self._free.move_to_end(key)
+                if len(free) < self.max_per_shape:
+                    free.append(buffer)
+            while len(self._free) > self.max_shapes:
+                self._free.popitem(last=False)
+
 class TrackSectorAnalyzer:
     """Analyze track sectors and performance"""
     
     def __init__(self, num_sectors: int = 3):
         self.num_sectors = num_sectors
         self.action_classifier = DriverActionClassifier()
+        self._buffers = _BufferPool()
     
     def create_sectors(self, total_distance: float) -> List[Tuple[float, float]]:
         """Create sector boundaries based on total distance"""
@@ -294,94 +516,236 @@ class TrackSectorAnalyzer:
         
         return sectors
     
-    def analyze_sector(self, sector_num: int, start_dist: float, end_dist: float,
-                      driver1_points: List[ComparisonPoint], 
-                      driver2_points: List[ComparisonPoint],
-                      driver1_name: str, driver2_name: str) -> SectorAnalysis:
-        """Analyze a specific sector"""
-        # Filter points for this sector
-        sector_points = [
-            p for p in driver1_points 
-            if start_dist <= p.distance <= end_dist
-        ]
-        
-        if not sector_points:
-            # Return empty analysis
-            return SectorAnalysis(
+    def point_times(self, points: ComparisonPoints,
+                    out: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per-point sector time estimates (distance / speed) for both drivers
+        
+        Stationary points contribute 0. The arrays are lap-wide, so any sector time
+        is a slice sum; compute them once and share them across sectors. out can
+        supply two float64 arrays of len(points) to fill instead of allocating.
+        """
+        if out is None:
+            driver1_time = np.zeros(len(points))
+            driver2_time = np.zeros(len(points))
+        else:
+            driver1_time, driver2_time = out
+            driver1_time.fill(0.0)
+            driver2_time.fill(0.0)
+        np.divide(points.distance, points.driver1_speed / 3.6, out=driver1_time, where=points.driver1_speed > 0)
+        np.divide(points.distance, points.driver2_speed / 3.6, out=driver2_time, where=points.driver2_speed > 0)
+        return driver1_time, driver2_time
+    
+    def analyze_sectors(self, points: ComparisonPoints, sectors: List[Tuple[float, float]],
+                        driver1_name: str, driver2_name: str) -> List[SectorAnalysis]:
+        """
+        Analyze all sectors in a single pass over the comparison arrays
+        
+        Distances are monotonic, so each sector's [start, end] range maps to an
+        index slice via searchsorted. Sums, extrema and action histograms for
+        every sector then come from one reduceat call per quantity rather than
+        re-scanning the lap for each sector. Results match analyze_sector.
+        """
+        if not sectors:
+            return []
+        
+        bounds = np.asarray(sectors, dtype=float)
+        starts = np.searchsorted(points.distance, bounds[:, 0], side='left')
+        ends = np.searchsorted(points.distance, bounds[:, 1], side='right')
+        counts = ends - starts
+        
+        # Sector end points are inclusive, so neighbouring sectors can share a sample.
+        # Interleaving starts and ends lets reduceat handle the overlap: even slots
+        # reduce [start, end), odd slots are discarded. The padding keeps an index of
+        # len(points) valid.
+        indices = np.column_stack((starts, ends)).ravel()
+        n_points = len(points)
+        
+        def reduce_segments(ufunc, values, dtype=None, fill_where=None, fill_value=0):
+            # Values are copied into a pooled (n_points + 1) scratch array; reduceat
+            # returns a fresh array, so the scratch can go straight back to the pool
+            padded = self._buffers.acquire((n_points + 1,) + values.shape[1:], dtype or values.dtype)
+            try:
+                np.copyto(padded[:n_points], values)
+                if fill_where is not None:
+                    np.copyto(padded[:n_points], fill_value, where=fill_where)
+                padded[n_points] = 0
+                return ufunc.reduceat(padded, indices, axis=0)[::2]
+            finally:
+                self._buffers.release(padded)
+        
+        driver1_stopped = ~(points.driver1_speed > 0)
+        driver2_stopped = ~(points.driver2_speed > 0)
+        time_buffers = (self._buffers.acquire((n_points,), np.float64),
+                        self._buffers.acquire((n_points,), np.float64))
+        try:
+            driver1_time, driver2_time = self.point_times(points, out=time_buffers)
+            driver1_sector_times = reduce_segments(np.add, driver1_time)
+            driver2_sector_times = reduce_segments(np.add, driver2_time)
+        finally:
+            self._buffers.release(*time_buffers)
+        
+        max_speed_deltas = reduce_segments(np.maximum, points.speed_delta)
+        speed_delta_sums = reduce_segments(np.add, points.speed_delta, dtype=np.float64)
+        advantage_counts = reduce_segments(np.add, points.speed_delta < 0, dtype=np.int64)
+        
+        driver1_min = reduce_segments(np.minimum, points.driver1_speed, fill_where=driver1_stopped, fill_value=np.inf)
+        driver1_max = reduce_segments(np.maximum, points.driver1_speed, fill_where=driver1_stopped, fill_value=-np.inf)
+        driver2_min = reduce_segments(np.minimum, points.driver2_speed, fill_where=driver2_stopped, fill_value=np.inf)
+        driver2_max = reduce_segments(np.maximum, points.driver2_speed, fill_where=driver2_stopped, fill_value=-np.inf)
+        
+        # Per-sector action histograms from a one-hot matrix of action codes
+        n_actions = len(_ACTIONS_BY_CODE)
+        driver1_hist = reduce_segments(np.add, np.eye(n_actions, dtype=np.int64)[points.driver1_action])
+        driver2_hist = reduce_segments(np.add, np.eye(n_actions, dtype=np.int64)[points.driver2_action])
+        
+        def finite_or_zero(value: float) -> float:
+            return value if np.isfinite(value) else 0
+        
+        analyses = []
+        for i, (start_dist, end_dist) in enumerate(sectors):
+            sector_num = i + 1
+            point_count = counts[i].item()
+            if point_count <= 0:
+                analyses.append(self._empty_sector(sector_num, start_dist, end_dist, driver1_name, driver2_name))
+                continue
+            
+            driver1_sector_time = driver1_sector_times[i].item()
+            driver2_sector_time = driver2_sector_times[i].item()
+            time_difference = driver1_sector_time - driver2_sector_time
+            
+            # Braking and throttle points
+            sector_slice = slice(starts[i], ends[i])
+            distance = points.distance[sector_slice]
+            driver1_actions = points.driver1_action[sector_slice]
+            driver2_actions = points.driver2_action[sector_slice]
+            
+            analyses.append(SectorAnalysis(
                 sector_number=sector_num,
                 start_distance=start_dist,
                 end_distance=end_dist,
-                driver1_sector_time=0,
-                driver2_sector_time=0,
-                time_difference=0,
-                dominant_driver="unknown",
-                max_speed_delta=0,
-                avg_speed_delta=0,
-                speed_advantage_distance=0,
-                braking_points={driver1_name: [], driver2_name: []},
-                throttle_application_points={driver1_name: [], driver2_name: []},
-                corner_speeds={driver1_name: {"min_speed": 0, "max_speed": 0}, 
-                              driver2_name: {"min_speed": 0, "max_speed": 0}},
-                action_distribution={driver1_name: {}, driver2_name: {}}
-            )
+                driver1_sector_time=driver1_sector_time,
+                driver2_sector_time=driver2_sector_time,
+                time_difference=time_difference,
+                dominant_driver=driver1_name if time_difference < 0 else driver2_name,
+                max_speed_delta=max_speed_deltas[i].item(),
+                avg_speed_delta=(speed_delta_sums[i] / point_count).item(),
+                speed_advantage_distance=(advantage_counts[i].item() / point_count) * (end_dist - start_dist),
+                braking_points={
+                    driver1_name: distance[driver1_actions == ACTION_BRAKING].tolist(),
+                    driver2_name: distance[driver2_actions == ACTION_BRAKING].tolist()
+                },
+                throttle_application_points={
+                    driver1_name: distance[driver1_actions == ACTION_FULL_THROTTLE].tolist(),
+                    driver2_name: distance[driver2_actions == ACTION_FULL_THROTTLE].tolist()
+                },
+                corner_speeds={
+                    driver1_name: {
+                        "min_speed": finite_or_zero(driver1_min[i].item()),
+                        "max_speed": finite_or_zero(driver1_max[i].item())
+                    },
+                    driver2_name: {
+                        "min_speed": finite_or_zero(driver2_min[i].item()),
+                        "max_speed": finite_or_zero(driver2_max[i].item())
+                    }
+                },
+                action_distribution={
+                    driver1_name: _distribution_from_counts(driver1_hist[i]),
+                    driver2_name: _distribution_from_counts(driver2_hist[i])
+                }
+            ))
         
-        # Calculate sector times (time to traverse the sector)
-        first_point = sector_points[0]
-        last_point = sector_points[-1]
+        return analyses
+    
+    def _empty_sector(self, sector_num: int, start_dist: float, end_dist: float,
+                      driver1_name: str, driver2_name: str) -> SectorAnalysis:
+        """Analysis for a sector with no aligned points"""
+        return SectorAnalysis(
+            sector_number=sector_num,
+            start_distance=start_dist,
+            end_distance=end_dist,
+            driver1_sector_time=0,
+            driver2_sector_time=0,
+            time_difference=0,
+            dominant_driver="unknown",
+            max_speed_delta=0,
+            avg_speed_delta=0,
+            speed_advantage_distance=0,
+            braking_points={driver1_name: [], driver2_name: []},
+            throttle_application_points={driver1_name: [], driver2_name: []},
+            corner_speeds={driver1_name: {"min_speed": 0, "max_speed": 0}, 
+                          driver2_name: {"min_speed": 0, "max_speed": 0}},
+            action_distribution={driver1_name: {}, driver2_name: {}}
+        )
+    
+    def analyze_sector(self, sector_num: int, start_dist: float, end_dist: float,
+                      points: ComparisonPoints,
+                      driver1_name: str, driver2_name: str,
+                      point_times: Optional[Tuple[np.ndarray, np.ndarray]] = None) -> SectorAnalysis:
+        """
+        Analyze a specific sector
+        
+        point_times can carry the lap-wide arrays from point_times() when several
+        sectors are analysed individually, so they are not recomputed per sector.
+        """
+        # Distances are monotonic, so the sector's [start, end] range is an index slice
+        sector_start = np.searchsorted(points.distance, start_dist, side='left')
+        sector_end = np.searchsorted(points.distance, end_dist, side='right')
+        point_count = int(sector_end - sector_start)
+        
+        if point_count <= 0:
+            return self._empty_sector(sector_num, start_dist, end_dist, driver1_name, driver2_name)
+        
+        sector_slice = slice(sector_start, sector_end)
+        distance = points.distance[sector_slice]
+        driver1_speed = points.driver1_speed[sector_slice]
+        driver2_speed = points.driver2_speed[sector_slice]
+        speed_deltas = points.speed_delta[sector_slice]
+        driver1_actions = points.driver1_action[sector_slice]
+        driver2_actions = points.driver2_action[sector_slice]
         
         # Estimate sector times based on distance and speed
-        driver1_times = [p.distance / (p.driver1_speed / 3.6) for p in sector_points if p.driver1_speed > 0]
-        driver2_times = [p.distance / (p.driver2_speed / 3.6) for p in sector_points if p.driver2_speed > 0]
-        
-        driver1_sector_time = sum(driver1_times) if driver1_times else 0
-        driver2_sector_time = sum(driver2_times) if driver2_times else 0
+        driver1_moving = driver1_speed > 0
+        driver2_moving = driver2_speed > 0
+        driver1_time, driver2_time = point_times if point_times is not None else self.point_times(points)
+        driver1_sector_time = driver1_time[sector_slice].sum().item()
+        driver2_sector_time = driver2_time[sector_slice].sum().item()
         time_difference = driver1_sector_time - driver2_sector_time
         dominant_driver = driver1_name if time_difference < 0 else driver2_name
         
         # Speed analysis
-        speed_deltas = [p.speed_delta for p in sector_points]
-        max_speed_delta = max(speed_deltas) if speed_deltas else 0
-        avg_speed_delta = np.mean(speed_deltas) if speed_deltas else 0
+        max_speed_delta = speed_deltas.max().item()
+        avg_speed_delta = speed_deltas.mean().item()
         
         # Calculate distance where each driver has speed advantage
-        driver1_advantage_points = sum(1 for p in sector_points if p.speed_delta < 0)
-        speed_advantage_distance = (driver1_advantage_points / len(sector_points)) * (end_dist - start_dist)
+        driver1_advantage_points = np.count_nonzero(speed_deltas < 0)
+        speed_advantage_distance = (driver1_advantage_points / point_count) * (end_dist - start_dist)
         
         # Braking and throttle points
-        driver1_braking = [p.distance for p in sector_points if p.driver1_action == DriverAction.BRAKING]
-        driver2_braking = [p.distance for p in sector_points if p.driver2_action == DriverAction.BRAKING]
+        driver1_braking = distance[driver1_actions == ACTION_BRAKING].tolist()
+        driver2_braking = distance[driver2_actions == ACTION_BRAKING].tolist()
         
-        driver1_throttle = [p.distance for p in sector_points if p.driver1_action == DriverAction.FULL_THROTTLE]
-        driver2_throttle = [p.distance for p in sector_points if p.driver2_action == DriverAction.FULL_THROTTLE]
+        driver1_throttle = distance[driver1_actions == ACTION_FULL_THROTTLE].tolist()
+        driver2_throttle = distance[driver2_actions == ACTION_FULL_THROTTLE].tolist()
         
         # Corner speeds (min/max in sector)
-        driver1_speeds = [p.driver1_speed for p in sector_points if p.driver1_speed > 0]
-        driver2_speeds = [p.driver2_speed for p in sector_points if p.driver2_speed > 0]
+        driver1_speeds = driver1_speed[driver1_moving]
+        driver2_speeds = driver2_speed[driver2_moving]
         
         corner_speeds = {
             driver1_name: {
-                "min_speed": min(driver1_speeds) if driver1_speeds else 0,
-                "max_speed": max(driver1_speeds) if driver1_speeds else 0
+                "min_speed": driver1_speeds.min().item() if driver1_speeds.size else 0,
+                "max_speed": driver1_speeds.max().item() if driver1_speeds.size else 0
             },
             driver2_name: {
-                "min_speed": min(driver2_speeds) if driver2_speeds else 0,
-                "max_speed": max(driver2_speeds) if driver2_speeds else 0
+                "min_speed": driver2_speeds.min().item() if driver2_speeds.size else 0,
+                "max_speed": driver2_speeds.max().item() if driver2_speeds.size else 0
             }
         }
         
         # Action distribution
-        driver1_actions = [p.driver1_action for p in sector_points]
-        driver2_actions = [p.driver2_action for p in sector_points]
-        
-        driver1_action_dist = {
-            action: (driver1_actions.count(action) / len(driver1_actions)) * 100
-            for action in DriverAction
-        } if driver1_actions else {}
-        
-        driver2_action_dist = {
-            action: (driver2_actions.count(action) / len(driver2_actions)) * 100
-            for action in DriverAction
-        } if driver2_actions else {}
+        driver1_action_dist = _action_percentages(driver1_actions)
+        driver2_action_dist = _action_percentages(driver2_actions)
         
         return SectorAnalysis(
             sector_number=sector_num,
@@ -412,9 +776,16 @@ class DataComparisonEngine:
     def compare_sessions(self, session1: SessionData, session2: SessionData,
                         use_fastest_laps: bool = True,
                         specific_lap1: Optional[int] = None,
-                        specific_lap2: Optional[int] = None) -> ComparisonResult:
-        """Perform comprehensive comparison between two sessions"""
-        start_time = datetime.now()
+                        specific_lap2: Optional[int] = None,
+                        materialize_points: bool = False) -> ComparisonResult:
+        """
+        Perform comprehensive comparison between two sessions
+        
+        By default the result keeps comparison points as arrays (ComparisonPoints),
+        which still index and iterate as ComparisonPoint objects on demand. Pass
+        materialize_points=True to get an eager List[ComparisonPoint] instead.
+        """
+        start_time = time.perf_counter()
         
         try:
             # Select laps for comparison
@@ -427,28 +798,26 @@ class DataComparisonEngine:
             # Align data using existing alignment engine
             alignment_result = self.alignment_engine.align_laps(lap1, lap2)
             
-            if not alignment_result.success:
-                raise ValueError(f"Data alignment failed: {alignment_result.error}")
+            if not alignment_result["success"]:
+                raise ValueError(f"Data alignment failed: {alignment_result.get('error', 'Unknown error')}")
             
             # Create comparison points
             comparison_points = self._create_comparison_points(
-                alignment_result.aligned_data, session1.driver_name, session2.driver_name
+                alignment_result["aligned_data"], session1.driver_name, session2.driver_name
             )
             
+            if not len(comparison_points):
+                raise ValueError("No aligned data points to compare")
+            
             # Perform sector analysis
-            total_distance = max(p.distance for p in comparison_points)
+            total_distance = comparison_points.distance.max().item()
             sectors = self.sector_analyzer.create_sectors(total_distance)
-            sector_analysis = []
-            
-            for i, (start_dist, end_dist) in enumerate(sectors):
-                sector = self.sector_analyzer.analyze_sector(
-                    i + 1, start_dist, end_dist, comparison_points, comparison_points,
-                    session1.driver_name, session2.driver_name
-                )
-                sector_analysis.append(sector)
+            sector_analysis = self.sector_analyzer.analyze_sectors(
+                comparison_points, sectors, session1.driver_name, session2.driver_name
+            )
             
             # Calculate overall metrics
-            total_time_delta = comparison_points[-1].time_delta if comparison_points else 0
+            total_time_delta = comparison_points.time_delta[-1].item()
             faster_driver = session1.driver_name if total_time_delta < 0 else session2.driver_name
             
             # Generate summary analyses
@@ -456,7 +825,7 @@ class DataComparisonEngine:
             action_analysis = self._analyze_action_comparison(comparison_points, session1.driver_name, session2.driver_name)
             dynamics_analysis = self._analyze_dynamics_comparison(comparison_points, session1.driver_name, session2.driver_name)
             
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.perf_counter() - start_time
             
             return ComparisonResult(
                 driver1_name=session1.driver_name,
@@ -467,7 +836,7 @@ class DataComparisonEngine:
                 faster_driver=faster_driver,
                 total_distance=total_distance,
                 data_points=len(comparison_points),
-                comparison_points=comparison_points,
+                comparison_points=list(comparison_points) if materialize_points else comparison_points,
                 sector_analysis=sector_analysis,
                 speed_analysis=speed_analysis,
                 action_analysis=action_analysis,
@@ -496,118 +865,86 @@ class DataComparisonEngine:
         return session.laps[0] if session.laps else None
     
     def _create_comparison_points(self, aligned_data: Dict[str, Any], 
-                                driver1_name: str, driver2_name: str) -> List[ComparisonPoint]:
-        """Create comparison points from aligned data"""
-        comparison_points = []
-        
-        if 'distance_meters' not in aligned_data:
-            return comparison_points
-        
-        distances = aligned_data['distance_meters']
-        
-        for i, distance in enumerate(distances):
-            try:
-                # Extract data for both drivers
-                driver1_data = {
-                    'speed': aligned_data.get('driver1_speed', [0] * len(distances))[i],
-                    'throttle': aligned_data.get('driver1_throttle', [0] * len(distances))[i],
-                    'brake': aligned_data.get('driver1_brake', [0] * len(distances))[i],
-                    'gear': aligned_data.get('driver1_gear', [1] * len(distances))[i],
-                    'rpm': aligned_data.get('driver1_rpm', [0] * len(distances))[i],
-                    'time': aligned_data.get('driver1_time', [0] * len(distances))[i],
-                }
-                
-                driver2_data = {
-                    'speed': aligned_data.get('driver2_speed', [0] * len(distances))[i],
-                    'throttle': aligned_data.get('driver2_throttle', [0] * len(distances))[i],
-                    'brake': aligned_data.get('driver2_brake', [0] * len(distances))[i],
-                    'gear': aligned_data.get('driver2_gear', [1] * len(distances))[i],
-                    'rpm': aligned_data.get('driver2_rpm', [0] * len(distances))[i],
-                    'time': aligned_data.get('driver2_time', [0] * len(distances))[i],
-                }
-                
-                # Calculate deltas
-                time_delta = driver1_data['time'] - driver2_data['time']
-                speed_delta = driver1_data['speed'] - driver2_data['speed']
-                throttle_delta = driver1_data['throttle'] - driver2_data['throttle']
-                brake_delta = driver1_data['brake'] - driver2_data['brake']
-                gear_delta = driver1_data['gear'] - driver2_data['gear']
-                rpm_delta = driver1_data['rpm'] - driver2_data['rpm']
-                
-                # Classify actions and dynamics
-                driver1_action = self.action_classifier.classify_action(
-                    driver1_data['throttle'], driver1_data['brake']
-                )
-                driver2_action = self.action_classifier.classify_action(
-                    driver2_data['throttle'], driver2_data['brake']
-                )
-                
-                # Simple dynamics classification (would need more data for full analysis)
-                driver1_dynamics = VehicleDynamics.NEUTRAL
-                driver2_dynamics = VehicleDynamics.NEUTRAL
-                
-                comparison_point = ComparisonPoint(
-                    distance=distance,
-                    time_delta=time_delta,
-                    speed_delta=speed_delta,
-                    throttle_delta=throttle_delta,
-                    brake_delta=brake_delta,
-                    gear_delta=gear_delta,
-                    rpm_delta=rpm_delta,
-                    driver1_speed=driver1_data['speed'],
-                    driver1_throttle=driver1_data['throttle'],
-                    driver1_brake=driver1_data['brake'],
-                    driver1_action=driver1_action,
-                    driver1_dynamics=driver1_dynamics,
-                    driver2_speed=driver2_data['speed'],
-                    driver2_throttle=driver2_data['throttle'],
-                    driver2_brake=driver2_data['brake'],
-                    driver2_action=driver2_action,
-                    driver2_dynamics=driver2_dynamics
-                )
-                
-                comparison_points.append(comparison_point)
-                
-            except (IndexError, KeyError) as e:
-                logger.warning(f"Error creating comparison point at index {i}: {e}")
-                continue
-        
-        return comparison_points
+                                driver1_name: str, driver2_name: str) -> ComparisonPoints:
+        """
+        Create comparison points from aligned data
+        
+        aligned_data is the DataAlignmentEngine layout: a common "distance" axis
+        plus per-driver channel arrays under "driver1" and "driver2". All deltas
+        and action classifications are computed as whole-array operations.
+        """
+        distances = np.ascontiguousarray(aligned_data.get('distance', []), dtype=float)
+        n_points = len(distances)
+        
+        # Telemetry channels carry a few significant digits, so float32 halves memory
+        # traffic without losing precision; distance and time stay float64 because
+        # they are cumulative and feed sector bounds and lap time deltas
+        zeros = np.zeros(n_points, dtype=np.float32)
+        ones = np.ones(n_points, dtype=np.float32)
+        time_zeros = np.zeros(n_points)
+        
+        # Missing channels share one read-only fallback array per default value
+        for fallback in (zeros, ones, time_zeros):
+            fallback.flags.writeable = False
+        defaults = {'speed': zeros, 'throttle': zeros, 'brake': zeros, 'gear': ones, 'rpm': zeros, 'time': time_zeros}
+        
+        def driver_channels(driver: str) -> Dict[str, np.ndarray]:
+            channels = aligned_data.get(driver, {})
+            resolved = {}
+            for name, fallback in defaults.items():
+                values = channels.get(name)
+                if values is None or len(values) != n_points:
+                    resolved[name] = fallback
+                else:
+                    resolved[name] = np.ascontiguousarray(values, dtype=fallback.dtype)
+            return resolved
+        
+        driver1 = driver_channels('driver1')
+        driver2 = driver_channels('driver2')
+        
+        return ComparisonPoints(
+            distance=distances,
+            time_delta=driver1['time'] - driver2['time'],
+            speed_delta=driver1['speed'] - driver2['speed'],
+            throttle_delta=driver1['throttle'] - driver2['throttle'],
+            brake_delta=driver1['brake'] - driver2['brake'],
+            gear_delta=driver1['gear'] - driver2['gear'],
+            rpm_delta=driver1['rpm'] - driver2['rpm'],
+            driver1_speed=driver1['speed'],
+            driver1_throttle=driver1['throttle'],
+            driver1_brake=driver1['brake'],
+            driver1_action=self.action_classifier.classify_actions_vec(driver1['throttle'], driver1['brake']),
+            driver2_speed=driver2['speed'],
+            driver2_throttle=driver2['throttle'],
+            driver2_brake=driver2['brake'],
+            driver2_action=self.action_classifier.classify_actions_vec(driver2['throttle'], driver2['brake'])
+        )
     
-    def _analyze_speed_comparison(self, points: List[ComparisonPoint]) -> Dict[str, Any]:
+    def _analyze_speed_comparison(self, points: ComparisonPoints) -> Dict[str, Any]:
         """Analyze speed comparison between drivers"""
         if not points:
             return {}
         
-        speed_deltas = [p.speed_delta for p in points]
+        speed_deltas = points.speed_delta
         
         return {
-            'max_speed_advantage': max(speed_deltas),
-            'max_speed_deficit': min(speed_deltas),
-            'avg_speed_delta': np.mean(speed_deltas),
-            'speed_advantage_percentage': (sum(1 for d in speed_deltas if d > 0) / len(speed_deltas)) * 100,
+            'max_speed_advantage': speed_deltas.max().item(),
+            'max_speed_deficit': speed_deltas.min().item(),
+            'avg_speed_delta': speed_deltas.mean().item(),
+            'speed_advantage_percentage': (np.count_nonzero(speed_deltas > 0) / len(speed_deltas)) * 100,
             'top_speed_zones': self._find_top_speed_zones(points),
-            'speed_consistency': np.std(speed_deltas)
+            'speed_consistency': speed_deltas.std().item()
         }
     
-    def _analyze_action_comparison(self, points: List[ComparisonPoint], 
+    def _analyze_action_comparison(self, points: ComparisonPoints, 
                                  driver1_name: str, driver2_name: str) -> Dict[str, Any]:
         """Analyze driver actions comparison"""
         if not points:
             return {}
         
-        driver1_actions = [p.driver1_action for p in points]
-        driver2_actions = [p.driver2_action for p in points]
-        
-        driver1_analysis = self.action_classifier.analyze_action_sequence(
-            [p.driver1_throttle for p in points],
-            [p.driver1_brake for p in points]
-        )
-        
-        driver2_analysis = self.action_classifier.analyze_action_sequence(
-            [p.driver2_throttle for p in points],
-            [p.driver2_brake for p in points]
-        )
+        # Actions were classified when the comparison points were built
+        driver1_analysis = self.action_classifier.analyze_action_sequence(codes=points.driver1_action)
+        driver2_analysis = self.action_classifier.analyze_action_sequence(codes=points.driver2_action)
         
         return {
             driver1_name: driver1_analysis,
@@ -618,7 +955,7 @@ class DataComparisonEngine:
             )
         }
     
-    def _analyze_dynamics_comparison(self, points: List[ComparisonPoint],
+    def _analyze_dynamics_comparison(self, points: ComparisonPoints,
                                    driver1_name: str, driver2_name: str) -> Dict[str, Any]:
         """Analyze vehicle dynamics comparison"""
         # This would be expanded with actual dynamics analysis
@@ -628,38 +965,36 @@ class DataComparisonEngine:
             'comparison_summary': 'Both drivers show neutral handling characteristics'
         }
     
-    def _find_top_speed_zones(self, points: List[ComparisonPoint]) -> List[Dict[str, Any]]:
+    def _find_top_speed_zones(self, points: ComparisonPoints) -> List[Dict[str, Any]]:
         """Find zones where drivers reach top speeds"""
-        zones = []
-        current_zone = None
-        
-        for i, point in enumerate(points):
-            # Define top speed as > 150 km/h
-            if point.driver1_speed > 150 or point.driver2_speed > 150:
-                if current_zone is None:
-                    current_zone = {
-                        'start_distance': point.distance,
-                        'start_index': i,
-                        'max_speed_driver1': point.driver1_speed,
-                        'max_speed_driver2': point.driver2_speed
-                    }
-                else:
-                    current_zone['max_speed_driver1'] = max(current_zone['max_speed_driver1'], point.driver1_speed)
-                    current_zone['max_speed_driver2'] = max(current_zone['max_speed_driver2'], point.driver2_speed)
-            else:
-                if current_zone is not None:
-                    current_zone['end_distance'] = points[i-1].distance if i > 0 else point.distance
-                    current_zone['end_index'] = i - 1
-                    zones.append(current_zone)
-                    current_zone = None
-        
-        # Close final zone if needed
-        if current_zone is not None:
-            current_zone['end_distance'] = points[-1].distance
-            current_zone['end_index'] = len(points) - 1
-            zones.append(current_zone)
-        
-        return zones
+        # Define top speed as > 150 km/h; zones are the runs of consecutive hot points
+        hot = (points.driver1_speed > 150) | (points.driver2_speed > 150)
+        edges = np.flatnonzero(np.diff(hot.astype(np.int8), prepend=0, append=0))
+        if edges.size == 0:
+            return []
+        
+        starts = edges[0::2]
+        ends = edges[1::2] - 1
+        
+        # reduceat over [start, end + 1) pairs; the appended sentinel keeps end + 1 == N a valid index
+        max_speed1 = np.maximum.reduceat(np.append(points.driver1_speed, 0.0), edges)[0::2]
+        max_speed2 = np.maximum.reduceat(np.append(points.driver2_speed, 0.0), edges)[0::2]
+        
+        return [
+            {
+                'start_distance': start_distance,
+                'start_index': start,
+                'max_speed_driver1': speed1,
+                'max_speed_driver2': speed2,
+                'end_distance': end_distance,
+                'end_index': end
+            }
+            for start, end, start_distance, end_distance, speed1, speed2 in zip(
+                starts.tolist(), ends.tolist(),
+                points.distance[starts].tolist(), points.distance[ends].tolist(),
+                max_speed1.tolist(), max_speed2.tolist()
+            )
+        ]
     
     def _compare_action_distributions(self, dist1: Dict[DriverAction, float], 
                                     dist2: Dict[DriverAction, float]) -> Dict[str, float]:
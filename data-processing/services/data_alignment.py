@@ -1,10 +1,46 @@
-import pandas as pd
+import threading
+import weakref
 import numpy as np
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Tuple, Optional
-from scipy.interpolate import interp1d
-from scipy.spatial.distance import cdist
-import math
 from models.telemetry_models import SessionData, LapData, TelemetryDataPoint
+from .data_cleaner import widen_float32
+
+# Number of aligned lap pairs each engine keeps around for repeat requests
+ALIGNED_LAP_CACHE_SIZE = 64
+
+def _masked_mean(arr: np.ndarray, mask: np.ndarray) -> float:
+    """
+    Mean of the selected samples accumulated in float64, 0.0 when nothing is selected
+    """
+    selected = arr[mask]
+    if selected.size == 0:
+        return 0.0
+    return float(selected.sum(dtype=np.float64) / selected.size)
+
+def _corner_metrics(speed: np.ndarray, threshold_frac: float) -> Tuple[float, float, int]:
+    """
+    Share of samples below threshold_frac of the mean speed, their mean speed and count
+    """
+    threshold = speed.mean(dtype=np.float64) * threshold_frac
+    corners = speed < threshold
+    return float(corners.mean() * 100), _masked_mean(speed, corners), int(np.count_nonzero(corners))
+
+def _braking_metrics(brake: np.ndarray, speed: np.ndarray) -> Tuple[float, float]:
+    """
+    Share of heavy braking samples (brake > 50%) and mean speed while braking heavily
+    """
+    heavy_brake = brake > 50
+    points = min(brake.size, speed.size)
+    return float(heavy_brake.mean() * 100), _masked_mean(speed[:points], heavy_brake[:points])
+
+def _exit_metrics(throttle: np.ndarray, speed: np.ndarray, low_speed_threshold: float) -> Tuple[float, int]:
+    """
+    Mean throttle where speed rises from below low_speed_threshold, and number of such samples
+    """
+    exit_zones = np.flatnonzero((speed[:-1] < low_speed_threshold) & (speed[1:] > speed[:-1])) + 1
+    return _masked_mean(throttle, exit_zones[exit_zones < throttle.size]), int(exit_zones.size)
 
 class DataAlignmentEngine:
     """
@@ -13,10 +49,13 @@ class DataAlignmentEngine:
     
     def __init__(self):
         self.gps_earth_radius = 6371000  # Earth radius in meters for GPS calculations
+        # (id(lap1), id(lap2)) -> (weakref(lap1), weakref(lap2), len1, len2, aligned_data)
+        self._aligned_laps: "OrderedDict[Tuple[int, int], Tuple]" = OrderedDict()
+        self._aligned_laps_lock = threading.Lock()
         
     def align_sessions(self, session1: SessionData, session2: SessionData, 
                       use_fastest_laps: bool = True, specific_lap1: Optional[int] = None,
-                      specific_lap2: Optional[int] = None) -> Dict[str, Any]:
+                      specific_lap2: Optional[int] = None, as_lists: bool = True) -> Dict[str, Any]:
         """
         Align two sessions for comparison, typically using fastest laps
         
@@ -26,6 +65,9 @@ class DataAlignmentEngine:
             use_fastest_laps: Whether to use fastest laps for comparison (default: True)
             specific_lap1: Specific lap number from session1 (overrides fastest lap)
             specific_lap2: Specific lap number from session2 (overrides fastest lap)
+            as_lists: Return aligned channels as plain lists (default: True); when
+                False they stay numpy arrays, shared with the alignment cache and
+                so read-only, for callers that serialize them themselves
             
         Returns:
             Dictionary containing aligned data and comparison metrics
@@ -50,18 +92,11 @@ class DataAlignmentEngine:
                     "lap2_available": lap2 is not None
                 }
             
-            # Calculate distance-based alignment
-            lap1_distance_aligned = self._calculate_distance_alignment(lap1)
-            lap2_distance_aligned = self._calculate_distance_alignment(lap2)
+            lap_alignment = self.align_laps(lap1, lap2)
+            if not lap_alignment["success"]:
+                return lap_alignment
             
-            if not lap1_distance_aligned or not lap2_distance_aligned:
-                return {
-                    "success": False,
-                    "error": "Failed to calculate distance alignment for laps"
-                }
-            
-            # Align data points by distance
-            aligned_data = self._align_by_distance(lap1_distance_aligned, lap2_distance_aligned)
+            aligned_data = lap_alignment["aligned_data"]
             
             # Calculate comparative metrics
             comparison_metrics = self._calculate_comparison_metrics(aligned_data)
@@ -83,12 +118,12 @@ class DataAlignmentEngine:
                     "lap_time": lap2.lap_time,
                     "is_fastest": lap2.is_fastest
                 },
-                "aligned_data": aligned_data,
+                "aligned_data": self._aligned_data_to_lists(aligned_data) if as_lists else aligned_data,
                 "comparison_metrics": comparison_metrics,
                 "sector_analysis": sector_analysis,
                 "alignment_info": {
-                    "total_distance": aligned_data["distance"][-1] if aligned_data["distance"] else 0,
-                    "data_points": len(aligned_data["distance"]) if aligned_data["distance"] else 0,
+                    "total_distance": float(aligned_data["distance"][-1]) if len(aligned_data["distance"]) else 0,
+                    "data_points": len(aligned_data["distance"]),
                     "interpolation_spacing": 10  # meters
                 }
             }
@@ -99,7 +134,231 @@ class DataAlignmentEngine:
                 "error": f"Error aligning sessions: {str(e)}"
             }
     
-    def _calculate_distance_alignment(self, lap: LapData) -> Optional[List[Dict[str, Any]]]:
+    def align_laps(self, lap1: LapData, lap2: LapData) -> Dict[str, Any]:
+        """
+        Align two specific laps onto a common distance axis
+        
+        Args:
+            lap1: First driver's lap
+            lap2: Second driver's lap
+            
+        Returns:
+            Dictionary with success flag and the aligned data
+            ({"distance": ndarray, "driver1": {channel: ndarray}, "driver2": {...}});
+            align_sessions converts these arrays to lists for its response
+        """
+        try:
+            cached = self._get_aligned_laps(lap1, lap2)
+            if cached is not None:
+                return {
+                    "success": True,
+                    "aligned_data": cached
+                }
+            
+            if lap1 is lap2:
+                # Comparing a lap against itself: align it once and let both
+                # drivers share the interpolated channels
+                aligned_data = self._align_lap_with_itself(lap1)
+                if aligned_data is None:
+                    return {
+                        "success": False,
+                        "error": "Failed to calculate distance alignment for laps"
+                    }
+                self._store_aligned_laps(lap1, lap2, aligned_data)
+                return {
+                    "success": True,
+                    "aligned_data": aligned_data
+                }
+            
+            # Calculate distance-based alignment
+            lap1_distance_aligned = self._calculate_distance_alignment(lap1)
+            lap2_distance_aligned = self._calculate_distance_alignment(lap2)
+            
+            if not lap1_distance_aligned or not lap2_distance_aligned:
+                return {
+                    "success": False,
+                    "error": "Failed to calculate distance alignment for laps"
+                }
+            
+            # Align data points by distance
+            aligned_data = self._align_by_distance(lap1_distance_aligned, lap2_distance_aligned)
+            self._store_aligned_laps(lap1, lap2, aligned_data)
+            
+            return {
+                "success": True,
+                "aligned_data": aligned_data
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Error aligning laps: {str(e)}"
+            }
+    
+    def align_laps_batch(self, pairs: List[Tuple[LapData, LapData]],
+                         max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Align several lap pairings, e.g. every lap of one driver against another's fastest
+        
+        Each distinct lap is converted to distance-aligned columns once, however many
+        pairs it appears in; the interpolation of the pairs then runs on a thread pool
+        (NumPy releases the GIL for the array work). Previously aligned pairs are served
+        from the cache used by align_laps.
+        
+        Args:
+            pairs: (lap1, lap2) tuples to align
+            max_workers: Thread pool size (default: ThreadPoolExecutor's default)
+            
+        Returns:
+            One align_laps-style result per pair, in the order given
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(pairs)
+        pending = []
+        
+        for index, (lap1, lap2) in enumerate(pairs):
+            cached = self._get_aligned_laps(lap1, lap2)
+            if cached is not None:
+                results[index] = {"success": True, "aligned_data": cached}
+            else:
+                pending.append(index)
+        
+        # Column extraction walks the pydantic data points, so do it once per lap
+        lap_columns: Dict[int, Optional[Dict[str, np.ndarray]]] = {}
+        for index in pending:
+            for lap in pairs[index]:
+                if id(lap) not in lap_columns:
+                    try:
+                        lap_columns[id(lap)] = self._calculate_distance_alignment(lap)
+                    except Exception as e:
+                        print(f"Error calculating distance alignment: {e}")
+                        lap_columns[id(lap)] = None
+        
+        def align_pair(index: int) -> Dict[str, Any]:
+            lap1, lap2 = pairs[index]
+            try:
+                lap1_distance_aligned = lap_columns[id(lap1)]
+                lap2_distance_aligned = lap_columns[id(lap2)]
+                if not lap1_distance_aligned or not lap2_distance_aligned:
+                    return {
+                        "success": False,
+                        "error": "Failed to calculate distance alignment for laps"
+                    }
+                
+                aligned_data = self._align_by_distance(lap1_distance_aligned, lap2_distance_aligned)
+                self._store_aligned_laps(lap1, lap2, aligned_data)
+                return {
+                    "success": True,
+                    "aligned_data": aligned_data
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "error": f"Error aligning laps: {str(e)}"
+                }
+        
+        if len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for index, result in zip(pending, executor.map(align_pair, pending)):
+                    results[index] = result
+        else:
+            for index in pending:
+                results[index] = align_pair(index)
+        
+        return results
+    
+    def _align_lap_with_itself(self, lap: LapData) -> Optional[Dict[str, Any]]:
+        """
+        Build the aligned layout for a lap compared against itself
+        
+        Args:
+            lap: The lap selected for both drivers
+            
+        Returns:
+            Aligned data whose driver1 and driver2 channels are the same arrays,
+            or None if the lap has no usable data
+        """
+        lap_distance_aligned = self._calculate_distance_alignment(lap)
+        if not lap_distance_aligned:
+            return None
+        
+        total_distance = lap_distance_aligned["distance"][-1] if len(lap_distance_aligned["distance"]) else 0
+        common_distances = np.arange(0, total_distance, 10.0)
+        interpolated = self._interpolate_lap_data(lap_distance_aligned, common_distances)
+        
+        return {
+            "distance": common_distances,
+            "driver1": interpolated,
+            "driver2": dict(interpolated)
+        }
+    
+    def _aligned_data_to_lists(self, aligned_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert aligned channel arrays to plain lists for JSON serialization
+        
+        Args:
+            aligned_data: Aligned data as produced by align_laps
+            
+        Returns:
+            A new dictionary with the same layout holding lists
+        """
+        def to_list(values) -> list:
+            return widen_float32(np.asarray(values)).tolist()
+        
+        return {
+            "distance": to_list(aligned_data["distance"]),
+            "driver1": {channel: to_list(values) for channel, values in aligned_data["driver1"].items()},
+            "driver2": {channel: to_list(values) for channel, values in aligned_data["driver2"].items()}
+        }
+    
+    def _get_aligned_laps(self, lap1: LapData, lap2: LapData) -> Optional[Dict[str, Any]]:
+        """
+        Look up a previous alignment of exactly these two lap objects
+        
+        Entries hold weak references, so a lap that has been garbage collected
+        (and whose id may since have been reused) never produces a hit. Laps are
+        treated as immutable once parsed; the point count guards against a lap
+        whose data_points were replaced in place.
+        
+        Args:
+            lap1: First driver's lap
+            lap2: Second driver's lap
+            
+        Returns:
+            The cached aligned data (shared, must not be mutated) or None
+        """
+        key = (id(lap1), id(lap2))
+        with self._aligned_laps_lock:
+            entry = self._aligned_laps.get(key)
+            if entry is None:
+                return None
+            ref1, ref2, points1, points2, aligned_data = entry
+            if (ref1() is not lap1 or ref2() is not lap2
+                    or points1 != len(lap1.data_points) or points2 != len(lap2.data_points)):
+                del self._aligned_laps[key]
+                return None
+            self._aligned_laps.move_to_end(key)
+            return aligned_data
+    
+    def _store_aligned_laps(self, lap1: LapData, lap2: LapData, aligned_data: Dict[str, Any]):
+        """Remember an alignment, evicting the least recently used pair when full"""
+        try:
+            entry = (weakref.ref(lap1), weakref.ref(lap2),
+                     len(lap1.data_points), len(lap2.data_points), aligned_data)
+        except TypeError:
+            # Lap objects that cannot be weakly referenced are simply not cached
+            return
+        # Cached arrays are handed to every later caller, so freeze them
+        for values in (aligned_data["distance"], *aligned_data["driver1"].values(), *aligned_data["driver2"].values()):
+            if isinstance(values, np.ndarray):
+                values.flags.writeable = False
+        key = (id(lap1), id(lap2))
+        with self._aligned_laps_lock:
+            self._aligned_laps[key] = entry
+            self._aligned_laps.move_to_end(key)
+            while len(self._aligned_laps) > ALIGNED_LAP_CACHE_SIZE:
+                self._aligned_laps.popitem(last=False)
+    
+    def _calculate_distance_alignment(self, lap: LapData) -> Optional[Dict[str, np.ndarray]]:
         """
         Calculate cumulative distance along track using GPS coordinates and speed
         
@@ -107,66 +366,54 @@ class DataAlignmentEngine:
             lap: LapData containing telemetry points
             
         Returns:
-            List of data points with calculated distance values
+            Column arrays (one entry per data point) with calculated distance values;
+            missing speed/throttle/brake/rpm read as 0, gear as 1, others as NaN
         """
         try:
             if not lap.data_points:
                 return None
             
-            aligned_points = []
-            cumulative_distance = 0.0
-            
-            for i, point in enumerate(lap.data_points):
-                if i == 0:
-                    # First point starts at distance 0
-                    aligned_points.append({
-                        "distance": 0.0,
-                        "time": point.time,
-                        "speed": point.speed or 0,
-                        "throttle": point.throttle_pos or 0,
-                        "brake": point.brake_pos or 0,
-                        "gear": point.gear or 1,
-                        "rpm": point.rpm or 0,
-                        "gps_lat": point.gps_latitude,
-                        "gps_lon": point.gps_longitude,
-                        "water_temp": point.water_temp,
-                        "oil_temp": point.oil_temp
-                    })
-                    continue
-                
-                # Calculate distance from previous point
-                prev_point = lap.data_points[i-1]
-                
-                # Try GPS-based distance calculation first
-                if (point.gps_latitude and point.gps_longitude and 
-                    prev_point.gps_latitude and prev_point.gps_longitude):
-                    distance_increment = self._calculate_gps_distance(
-                        prev_point.gps_latitude, prev_point.gps_longitude,
-                        point.gps_latitude, point.gps_longitude
-                    )
-                else:
-                    # Fallback to speed-based distance calculation
-                    time_diff = point.time - prev_point.time
-                    avg_speed = ((point.speed or 0) + (prev_point.speed or 0)) / 2
-                    distance_increment = (avg_speed * 1000 / 3600) * time_diff  # Convert km/h to m/s
-                
-                cumulative_distance += distance_increment
-                
-                aligned_points.append({
-                    "distance": cumulative_distance,
-                    "time": point.time,
-                    "speed": point.speed or 0,
-                    "throttle": point.throttle_pos or 0,
-                    "brake": point.brake_pos or 0,
-                    "gear": point.gear or 1,
-                    "rpm": point.rpm or 0,
-                    "gps_lat": point.gps_latitude,
-                    "gps_lon": point.gps_longitude,
-                    "water_temp": point.water_temp,
-                    "oil_temp": point.oil_temp
-                })
-            
-            return aligned_points
+            n_points = len(lap.data_points)
+            
+            # The lap's cached channel arrays (NaN where a point has no value) are
+            # shared with other analyses, so they are only read here
+            def filled(field: str, fill: float) -> np.ndarray:
+                values = lap.channel(field)
+                return np.where(np.isnan(values) | (values == 0), fill, values).astype(np.float32)
+            
+            # Sensor channels are float32; time, distance and GPS stay float64 since
+            # lap deltas and Haversine increments need the extra precision
+            lap_data = {
+                "time": lap.channel("time").copy(),
+                "speed": filled("speed", 0),
+                "throttle": filled("throttle_pos", 0),
+                "brake": filled("brake_pos", 0),
+                "gear": filled("gear", 1),
+                "rpm": filled("rpm", 0),
+                "gps_lat": lap.channel("gps_latitude").copy(),
+                "gps_lon": lap.channel("gps_longitude").copy(),
+                "water_temp": lap.channel("water_temp").astype(np.float32),
+                "oil_temp": lap.channel("oil_temp").astype(np.float32)
+            }
+            
+            # Cumulative distance for every point at once; each increment uses GPS
+            # when both ends have (non-zero) coordinates, otherwise the average speed
+            has_gps = np.ones(n_points, dtype=bool)
+            for coordinate in (lap_data["gps_lat"], lap_data["gps_lon"]):
+                has_gps &= (coordinate != 0) & ~np.isnan(coordinate)
+            lats = np.where(has_gps, lap_data["gps_lat"], 0.0)
+            lons = np.where(has_gps, lap_data["gps_lon"], 0.0)
+            speeds = lap_data["speed"].astype(float)
+            
+            gps_increments = self._calculate_gps_distances(lats[:-1], lons[:-1], lats[1:], lons[1:])
+            speed_increments = ((speeds[1:] + speeds[:-1]) / 2 * 1000 / 3600) * np.diff(lap_data["time"])  # Convert km/h to m/s
+            increments = np.where(has_gps[1:] & has_gps[:-1], gps_increments, speed_increments)
+            
+            distances = np.zeros(n_points)
+            np.cumsum(increments, out=distances[1:])
+            lap_data["distance"] = distances
+            
+            return lap_data
             
         except Exception as e:
             print(f"Error calculating distance alignment: {e}")
@@ -179,23 +426,50 @@ class DataAlignmentEngine:
         Returns:
             Distance in meters
         """
-        # Convert degrees to radians
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1) 
-        lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
+        # Single Haversine implementation shared with the vectorised path
+        return float(self._calculate_gps_distances(
+            np.array([lat1]), np.array([lon1]), np.array([lat2]), np.array([lon2])
+        )[0])
+    
+    def _calculate_gps_distances(self, lat1: np.ndarray, lon1: np.ndarray,
+                                 lat2: np.ndarray, lon2: np.ndarray) -> np.ndarray:
+        """
+        Vectorised Haversine distance between paired GPS points
         
-        # Haversine formula
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
+        Intermediate terms are computed in place to keep the number of
+        full-length temporaries down.
+        
+        Returns:
+            Array of distances in meters
+        """
+        lat1_rad = np.radians(lat1)
+        lat2_rad = np.radians(lat2)
         
-        a = (math.sin(dlat/2)**2 + 
-             math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2)
-        c = 2 * math.asin(math.sqrt(a))
+        # sin^2(dlat / 2)
+        a = np.subtract(lat2_rad, lat1_rad)
+        a /= 2
+        np.sin(a, out=a)
+        a *= a
         
-        return self.gps_earth_radius * c
+        # cos(lat1) * cos(lat2) * sin^2(dlon / 2)
+        half_dlon = np.radians(lon2)
+        half_dlon -= np.radians(lon1)
+        half_dlon /= 2
+        np.sin(half_dlon, out=half_dlon)
+        half_dlon *= half_dlon
+        cos_product = np.cos(lat1_rad, out=lat1_rad)
+        cos_product *= np.cos(lat2_rad, out=lat2_rad)
+        cos_product *= half_dlon
+        a += cos_product
+        
+        np.sqrt(a, out=a)
+        np.arcsin(a, out=a)
+        a *= 2
+        a *= self.gps_earth_radius
+        return a
     
-    def _align_by_distance(self, lap1_data: List[Dict], lap2_data: List[Dict]) -> Dict[str, List[float]]:
+    def _align_by_distance(self, lap1_data: Dict[str, np.ndarray],
+                           lap2_data: Dict[str, np.ndarray]) -> Dict[str, Any]:
         """
         Align two laps by distance using interpolation for consistent spacing
         
@@ -208,9 +482,8 @@ class DataAlignmentEngine:
         """
         try:
             # Determine common distance range
-            max_distance1 = lap1_data[-1]["distance"] if lap1_data else 0
-            max_distance2 = lap2_data[-1]["distance"] if lap2_data else 0
-            min_distance = min(max_distance1, max_distance2)
+            # align_laps only gets here with at least one point per lap
+            min_distance = min(lap1_data["distance"][-1], lap2_data["distance"][-1])
             
             # Create common distance points (every 10 meters)
             distance_spacing = 10.0
@@ -221,21 +494,21 @@ class DataAlignmentEngine:
             lap2_interpolated = self._interpolate_lap_data(lap2_data, common_distances)
             
             return {
-                "distance": common_distances.tolist(),
+                "distance": common_distances,
                 "driver1": lap1_interpolated,
                 "driver2": lap2_interpolated
             }
             
         except Exception as e:
             print(f"Error aligning by distance: {e}")
-            return {"distance": [], "driver1": {}, "driver2": {}}
+            return {"distance": np.empty(0), "driver1": {}, "driver2": {}}
     
-    def _interpolate_lap_data(self, lap_data: List[Dict], target_distances: np.ndarray) -> Dict[str, List[float]]:
+    def _interpolate_lap_data(self, lap_data: Dict[str, np.ndarray], target_distances: np.ndarray) -> Dict[str, np.ndarray]:
         """
         Interpolate lap data to match target distance points
         
         Args:
-            lap_data: Original lap data with distance values
+            lap_data: Original lap data columns, including distance
             target_distances: Array of target distance points
             
         Returns:
@@ -243,39 +516,82 @@ class DataAlignmentEngine:
         """
         try:
             # Extract distance and data arrays
-            distances = np.array([point["distance"] for point in lap_data])
+            distances = lap_data["distance"]
             
             interpolated = {}
             
             # Interpolate each data channel
             channels = ["time", "speed", "throttle", "brake", "gear", "rpm", "water_temp", "oil_temp"]
+            columns = {}
             
             for channel in channels:
-                values = np.array([point.get(channel, 0) for point in lap_data])
+                values = lap_data.get(channel)
+                if values is None:
+                    values = np.zeros(len(distances))
                 
                 # Handle special cases for gear (should be integer-like)
                 if channel == "gear":
-                    values = np.array([max(1, int(point.get(channel, 1))) for point in lap_data])
+                    values = np.maximum(1, np.trunc(values))
+                
+                columns[channel] = values
+            
+            # Channels without gaps on a sorted distance axis share one set of
+            # interpolation indices and weights. Like np.interp, targets outside the
+            # recorded distance are clamped to the end values and repeated distances
+            # (car stationary) take the later sample; channels are grouped by dtype
+            # so float32 channels are interpolated in float32.
+            batched = []
+            if len(distances) > 1 and not np.isnan(distances).any() and np.all(distances[1:] >= distances[:-1]):
+                batched = [channel for channel in channels if not np.isnan(columns[channel]).any()]
+            
+            if batched:
+                clamped = np.clip(target_distances, distances[0], distances[-1])
+                hi = np.searchsorted(distances, clamped, side='right').clip(1, len(distances) - 1)
+                lo = hi - 1
+                x_lo = distances[lo]
+                segment_length = distances[hi] - x_lo
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    weight = np.where(segment_length > 0, (clamped - x_lo) / segment_length, 1.0)
+                
+                groups = {}
+                for channel in batched:
+                    groups.setdefault(columns[channel].dtype, []).append(channel)
+                
+                for dtype, group in groups.items():
+                    values = np.stack([columns[channel] for channel in group])
+                    y_lo = values[:, lo]
+                    results = (values[:, hi] - y_lo) * weight.astype(dtype, copy=False) + y_lo
+                    
+                    for channel, result in zip(group, results):
+                        interpolated[channel] = result
+            
+            # Remaining channels have gaps (or an unsorted axis): filter and interpolate individually
+            for channel in channels:
+                if channel in interpolated:
+                    continue
+                values = columns[channel]
                 
                 # Only interpolate if we have valid data
                 if len(distances) > 1 and len(values) > 1:
                     # Remove any NaN or invalid values
                     valid_indices = ~np.isnan(values) & ~np.isnan(distances)
                     if np.sum(valid_indices) > 1:
-                        interp_func = interp1d(
-                            distances[valid_indices], 
-                            values[valid_indices],
-                            kind='linear',
-                            fill_value='extrapolate',
-                            bounds_error=False
-                        )
-                        interpolated[channel] = interp_func(target_distances).tolist()
+                        valid_distances = distances[valid_indices]
+                        valid_values = values[valid_indices]
+                        if np.any(valid_distances[1:] < valid_distances[:-1]):
+                            order = np.argsort(valid_distances, kind='stable')
+                            valid_distances = valid_distances[order]
+                            valid_values = valid_values[order]
+                        # np.interp holds the end values past either end of the lap
+                        interpolated[channel] = np.interp(
+                            target_distances, valid_distances, valid_values
+                        ).astype(values.dtype, copy=False)
                     else:
-                        interpolated[channel] = [0] * len(target_distances)
+                        interpolated[channel] = np.zeros(len(target_distances))
                 else:
-                    interpolated[channel] = [0] * len(target_distances)
+                    interpolated[channel] = np.zeros(len(target_distances))
             
-            return interpolated
+            return {channel: interpolated[channel] for channel in channels}
             
         except Exception as e:
             print(f"Error interpolating lap data: {e}")
@@ -296,14 +612,21 @@ class DataAlignmentEngine:
             driver2 = aligned_data["driver2"]
             distances = aligned_data["distance"]
             
-            if not driver1 or not driver2 or not distances:
+            if not driver1 or not driver2 or len(distances) == 0:
                 return {}
             
             metrics = {}
             
+            # Convert each shared channel once; the reductions below reuse these arrays
+            def channel_pair(name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+                if name in driver1 and name in driver2:
+                    return np.asarray(driver1[name], dtype=float), np.asarray(driver2[name], dtype=float)
+                return None
+            
             # Speed comparison
-            if "speed" in driver1 and "speed" in driver2:
-                speed_diff = np.array(driver1["speed"]) - np.array(driver2["speed"])
+            speeds = channel_pair("speed")
+            if speeds is not None:
+                speed_diff = speeds[0] - speeds[1]
                 metrics["speed_comparison"] = {
                     "max_speed_advantage_driver1": float(np.max(speed_diff)),
                     "max_speed_advantage_driver2": float(np.min(speed_diff)),
@@ -318,18 +641,22 @@ class DataAlignmentEngine:
                 )
             
             # Throttle and brake comparison
-            if "throttle" in driver1 and "throttle" in driver2:
-                throttle_diff = np.array(driver1["throttle"]) - np.array(driver2["throttle"])
+            # The mean difference is the difference of the means, so each channel is
+            # reduced once per driver instead of also materialising a diff array
+            throttles = channel_pair("throttle")
+            if throttles is not None:
+                throttle_mean1, throttle_mean2 = throttles[0].mean(), throttles[1].mean()
                 metrics["throttle_comparison"] = {
-                    "avg_throttle_difference": float(np.mean(throttle_diff)),
-                    "more_aggressive_driver": 1 if np.mean(driver1["throttle"]) > np.mean(driver2["throttle"]) else 2
+                    "avg_throttle_difference": float(throttle_mean1 - throttle_mean2),
+                    "more_aggressive_driver": 1 if throttle_mean1 > throttle_mean2 else 2
                 }
             
-            if "brake" in driver1 and "brake" in driver2:
-                brake_diff = np.array(driver1["brake"]) - np.array(driver2["brake"])
+            brakes = channel_pair("brake")
+            if brakes is not None:
+                brake_mean1, brake_mean2 = brakes[0].mean(), brakes[1].mean()
                 metrics["brake_comparison"] = {
-                    "avg_brake_difference": float(np.mean(brake_diff)),
-                    "later_braker": 1 if np.mean(driver1["brake"]) < np.mean(driver2["brake"]) else 2
+                    "avg_brake_difference": float(brake_mean1 - brake_mean2),
+                    "later_braker": 1 if brake_mean1 < brake_mean2 else 2
                 }
             
             # Overall performance summary
@@ -341,7 +668,7 @@ class DataAlignmentEngine:
             print(f"Error calculating comparison metrics: {e}")
             return {}
     
-    def _find_advantage_zones(self, diff_array: np.ndarray, distances: List[float]) -> Dict[str, Any]:
+    def _find_advantage_zones(self, diff_array: np.ndarray, distances: np.ndarray) -> Dict[str, Any]:
         """
         Find zones where each driver has advantage
         
@@ -353,14 +680,15 @@ class DataAlignmentEngine:
             Dictionary with advantage zone information
         """
         try:
-            driver1_advantage = diff_array > 0
-            driver2_advantage = diff_array < 0
+            diff_array = np.asarray(diff_array)
+            point_count = len(diff_array)
             
+            # count_nonzero counts the comparison masks without an integer sum pass
             return {
-                "driver1_advantage_percentage": float(np.sum(driver1_advantage) / len(diff_array) * 100),
-                "driver2_advantage_percentage": float(np.sum(driver2_advantage) / len(diff_array) * 100),
-                "biggest_driver1_advantage": float(np.max(diff_array)),
-                "biggest_driver2_advantage": float(np.abs(np.min(diff_array)))
+                "driver1_advantage_percentage": float(np.count_nonzero(diff_array > 0) / point_count * 100),
+                "driver2_advantage_percentage": float(np.count_nonzero(diff_array < 0) / point_count * 100),
+                "biggest_driver1_advantage": float(diff_array.max()),
+                "biggest_driver2_advantage": float(abs(diff_array.min()))
             }
         except:
             return {}
@@ -377,49 +705,58 @@ class DataAlignmentEngine:
             Dictionary with sector analysis
         """
         try:
-            distances = aligned_data["distance"]
-            if not distances:
+            distances = np.asarray(aligned_data["distance"], dtype=float)
+            if len(distances) == 0:
                 return {}
             
             total_distance = distances[-1]
             sector_length = total_distance / num_sectors
             
+            # Distances are monotonic, so each [start, end) sector is an index range
+            sector_bounds = np.searchsorted(distances, [
+                (sector * sector_length, (sector + 1) * sector_length) for sector in range(num_sectors)
+            ])
+            
+            driver1 = aligned_data["driver1"]
+            driver2 = aligned_data["driver2"]
+            point_counts = sector_bounds[:, 1] - sector_bounds[:, 0]
+            
+            # Sector averages for every sector from one reduceat per driver: even slots
+            # sum [first, stop), odd slots are discarded, and the appended 0 keeps a stop
+            # index of len(distances) valid
+            sector_speeds = None
+            if "speed" in driver1 and "speed" in driver2:
+                reduce_indices = sector_bounds.ravel()
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    sector_speeds = [
+                        (np.add.reduceat(np.append(np.asarray(driver["speed"], dtype=float), 0.0), reduce_indices)[::2]
+                         / point_counts).tolist()
+                        for driver in (driver1, driver2)
+                    ]
+            
             sector_analysis = {}
             
-            for sector in range(num_sectors):
-                sector_start = sector * sector_length
-                sector_end = (sector + 1) * sector_length
-                
-                # Find indices for this sector
-                sector_indices = [
-                    i for i, d in enumerate(distances) 
-                    if sector_start <= d < sector_end
-                ]
-                
-                if not sector_indices:
+            for sector, (first, stop) in enumerate(sector_bounds.tolist()):
+                if first >= stop:
                     continue
                 
-                driver1 = aligned_data["driver1"]
-                driver2 = aligned_data["driver2"]
-                
-                # Calculate sector averages
                 sector_data = {}
                 
-                if "speed" in driver1 and "speed" in driver2:
-                    driver1_sector_speed = np.mean([driver1["speed"][i] for i in sector_indices])
-                    driver2_sector_speed = np.mean([driver2["speed"][i] for i in sector_indices])
+                if sector_speeds is not None:
+                    driver1_sector_speed = sector_speeds[0][sector]
+                    driver2_sector_speed = sector_speeds[1][sector]
                     
                     sector_data["avg_speed"] = {
-                        "driver1": float(driver1_sector_speed),
-                        "driver2": float(driver2_sector_speed),
+                        "driver1": driver1_sector_speed,
+                        "driver2": driver2_sector_speed,
                         "advantage": "driver1" if driver1_sector_speed > driver2_sector_speed else "driver2",
-                        "difference": float(abs(driver1_sector_speed - driver2_sector_speed))
+                        "difference": abs(driver1_sector_speed - driver2_sector_speed)
                     }
                 
                 if "time" in driver1 and "time" in driver2:
                     # Calculate time spent in sector
-                    driver1_sector_time = driver1["time"][sector_indices[-1]] - driver1["time"][sector_indices[0]]
-                    driver2_sector_time = driver2["time"][sector_indices[-1]] - driver2["time"][sector_indices[0]]
+                    driver1_sector_time = driver1["time"][stop - 1] - driver1["time"][first]
+                    driver2_sector_time = driver2["time"][stop - 1] - driver2["time"][first]
                     
                     sector_data["sector_time"] = {
                         "driver1": float(driver1_sector_time),
@@ -450,12 +787,17 @@ class DataAlignmentEngine:
         try:
             summary = {}
             
+            # Channels are reduced in their stored (float32) dtype rather than
+            # copied up to float64 first; the means still accumulate in float64
+            
             # Speed metrics
             if "speed" in driver1 and "speed" in driver2:
-                driver1_max_speed = max(driver1["speed"])
-                driver2_max_speed = max(driver2["speed"])
-                driver1_avg_speed = np.mean(driver1["speed"])
-                driver2_avg_speed = np.mean(driver2["speed"])
+                speed1 = np.asarray(driver1["speed"])
+                speed2 = np.asarray(driver2["speed"])
+                driver1_max_speed = float(speed1.max())
+                driver2_max_speed = float(speed2.max())
+                driver1_avg_speed = float(speed1.mean(dtype=np.float64))
+                driver2_avg_speed = float(speed2.mean(dtype=np.float64))
                 
                 summary["speed_analysis"] = {
                     "faster_max_speed": "driver1" if driver1_max_speed > driver2_max_speed else "driver2",
@@ -466,8 +808,8 @@ class DataAlignmentEngine:
             
             # Driving style analysis
             if "throttle" in driver1 and "throttle" in driver2:
-                driver1_aggression = np.mean([max(0, x) for x in driver1["throttle"]])
-                driver2_aggression = np.mean([max(0, x) for x in driver2["throttle"]])
+                driver1_aggression = float(np.maximum(np.asarray(driver1["throttle"]), 0).mean(dtype=np.float64))
+                driver2_aggression = float(np.maximum(np.asarray(driver2["throttle"]), 0).mean(dtype=np.float64))
                 
                 summary["driving_style"] = {
                     "more_aggressive_throttle": "driver1" if driver1_aggression > driver2_aggression else "driver2",
@@ -480,21 +822,22 @@ class DataAlignmentEngine:
             print(f"Error calculating performance summary: {e}")
             return {}
     
-    def _calculate_lap_delta_detailed(self, driver1: Dict, driver2: Dict, distances: List[float]) -> Dict[str, Any]:
+    def _calculate_lap_delta_detailed(self, driver1: Dict, driver2: Dict, distances: np.ndarray) -> Dict[str, Any]:
         """
         Calculate detailed lap delta (time differences) between two drivers
         
         Args:
             driver1: Driver 1 telemetry data
             driver2: Driver 2 telemetry data  
-            distances: Distance array for alignment
+            distances: Distance array for alignment (non-empty; checked by
+                _calculate_comparison_metrics before calling)
             
         Returns:
             Detailed lap delta analysis including progressive time differences
         """
         try:
-            time1 = np.array(driver1["time"])
-            time2 = np.array(driver2["time"])
+            time1 = np.asarray(driver1["time"])
+            time2 = np.asarray(driver2["time"])
             
             # Calculate raw time delta (driver1 - driver2, negative means driver1 is behind)
             time_delta = time1 - time2
@@ -503,43 +846,54 @@ class DataAlignmentEngine:
             # This shows how the gap builds up over the lap
             cumulative_delta = time_delta - time_delta[0]  # Normalize to start at 0
             
-            # Find zero crossings (where drivers are equal)
-            zero_crossings = []
-            for i in range(1, len(cumulative_delta)):
-                if (cumulative_delta[i-1] > 0 and cumulative_delta[i] <= 0) or \
-                   (cumulative_delta[i-1] < 0 and cumulative_delta[i] >= 0):
-                    # Linear interpolation to find exact crossing point
-                    crossing_distance = distances[i-1] + \
-                        (distances[i] - distances[i-1]) * \
-                        abs(cumulative_delta[i-1]) / (abs(cumulative_delta[i-1]) + abs(cumulative_delta[i]))
-                    zero_crossings.append({
-                        "distance": float(crossing_distance),
-                        "index": i-1
-                    })
+            distance_array = np.asarray(distances, dtype=float)
+            
+            # Find zero crossings (where drivers are equal): the delta leaves a
+            # strictly positive or negative value and reaches zero or the other side
+            before = cumulative_delta[:-1]
+            after = cumulative_delta[1:]
+            crossing_indices = np.flatnonzero(((before > 0) & (after <= 0)) | ((before < 0) & (after >= 0)))
+            
+            # Linear interpolation to find exact crossing points
+            gap_before = np.abs(before[crossing_indices])
+            gap_after = np.abs(after[crossing_indices])
+            segment_start = distance_array[crossing_indices]
+            crossing_distances = segment_start + \
+                (distance_array[crossing_indices + 1] - segment_start) * gap_before / (gap_before + gap_after)
+            
+            zero_crossings = [
+                {"distance": crossing_distance, "index": index}
+                for crossing_distance, index in zip(crossing_distances.tolist(), crossing_indices.tolist())
+            ]
             
             # Find maximum gaps
             max_driver1_advantage_idx = np.argmax(cumulative_delta)
             max_driver2_advantage_idx = np.argmin(cumulative_delta)
             
+            # Summary statistics reuse these extremes instead of re-scanning the
+            # delta: the largest absolute gap is one of them, and std is sqrt(var)
+            max_time_gap = np.maximum(cumulative_delta[max_driver1_advantage_idx],
+                                      -cumulative_delta[max_driver2_advantage_idx])
+            delta_variance = np.var(cumulative_delta)
+            point_count = len(cumulative_delta)
+            
             # Calculate sector deltas (3 sectors)
             sector_deltas = []
             num_sectors = 3
-            total_distance = distances[-1] if distances else 0
+            total_distance = distance_array[-1]
             sector_length = total_distance / num_sectors
             
             for sector in range(num_sectors):
                 sector_start = sector * sector_length
                 sector_end = (sector + 1) * sector_length
                 
-                # Find indices for this sector
-                sector_indices = [
-                    i for i, d in enumerate(distances) 
-                    if sector_start <= d <= sector_end
-                ]
+                # Distances are monotonic, so the [start, end] sector is an index range
+                first = np.searchsorted(distance_array, sector_start, side='left')
+                stop = np.searchsorted(distance_array, sector_end, side='right')
                 
-                if sector_indices:
-                    sector_start_delta = cumulative_delta[sector_indices[0]]
-                    sector_end_delta = cumulative_delta[sector_indices[-1]]
+                if first < stop:
+                    sector_start_delta = cumulative_delta[first]
+                    sector_end_delta = cumulative_delta[stop - 1]
                     sector_time_gained = sector_end_delta - sector_start_delta
                     
                     sector_deltas.append({
@@ -554,32 +908,32 @@ class DataAlignmentEngine:
             return {
                 "time_delta_array": time_delta.tolist(),
                 "cumulative_delta_array": cumulative_delta.tolist(),
-                "distance_array": distances,
-                "time_delta_start": float(time_delta[0]) if len(time_delta) > 0 else 0,
-                "time_delta_end": float(time_delta[-1]) if len(time_delta) > 0 else 0,
-                "cumulative_delta_final": float(cumulative_delta[-1]) if len(cumulative_delta) > 0 else 0,
-                "max_time_gap": float(np.max(np.abs(cumulative_delta))),
+                "distance_array": distance_array.tolist(),
+                "time_delta_start": float(time_delta[0]),
+                "time_delta_end": float(time_delta[-1]),
+                "cumulative_delta_final": float(cumulative_delta[-1]),
+                "max_time_gap": float(max_time_gap),
                 "avg_time_delta": float(np.mean(time_delta)),
                 "zero_crossings": zero_crossings,
                 "max_advantages": {
                     "driver1_max_advantage": {
                         "time_gap": float(cumulative_delta[max_driver1_advantage_idx]),
-                        "distance": float(distances[max_driver1_advantage_idx]),
+                        "distance": float(distance_array[max_driver1_advantage_idx]),
                         "index": int(max_driver1_advantage_idx)
                     },
                     "driver2_max_advantage": {
                         "time_gap": float(abs(cumulative_delta[max_driver2_advantage_idx])),
-                        "distance": float(distances[max_driver2_advantage_idx]),
+                        "distance": float(distance_array[max_driver2_advantage_idx]),
                         "index": int(max_driver2_advantage_idx)
                     }
                 },
                 "sector_analysis": sector_deltas,
                 "statistics": {
-                    "driver1_ahead_percentage": float(np.sum(cumulative_delta > 0) / len(cumulative_delta) * 100),
-                    "driver2_ahead_percentage": float(np.sum(cumulative_delta < 0) / len(cumulative_delta) * 100),
-                    "even_percentage": float(np.sum(np.abs(cumulative_delta) < 0.1) / len(cumulative_delta) * 100),
-                    "delta_variance": float(np.var(cumulative_delta)),
-                    "delta_std": float(np.std(cumulative_delta))
+                    "driver1_ahead_percentage": float(np.count_nonzero(cumulative_delta > 0) / point_count * 100),
+                    "driver2_ahead_percentage": float(np.count_nonzero(cumulative_delta < 0) / point_count * 100),
+                    "even_percentage": float(np.count_nonzero(np.abs(cumulative_delta) < 0.1) / point_count * 100),
+                    "delta_variance": float(delta_variance),
+                    "delta_std": float(np.sqrt(delta_variance))
                 }
             }
             
@@ -670,22 +1024,19 @@ class ComparisonCalculator:
         Identify cornering zones based on speed reduction patterns
         """
         try:
-            # Simple corner detection: significant speed reduction
-            avg_speed1 = np.mean(speed1)
-            avg_speed2 = np.mean(speed2)
+            # Aligned speeds are float32 already; means accumulate in float64
+            speeds1 = np.ascontiguousarray(speed1, dtype=np.float32)
+            speeds2 = np.ascontiguousarray(speed2, dtype=np.float32)
             
-            # Find zones where speed drops below 80% of average
-            threshold1 = avg_speed1 * 0.8
-            threshold2 = avg_speed2 * 0.8
-            
-            corners1 = np.array(speed1) < threshold1
-            corners2 = np.array(speed2) < threshold2
+            # Simple corner detection: speed below 80% of the lap average
+            corner_pct1, corner_speed1, _ = _corner_metrics(speeds1, 0.8)
+            corner_pct2, corner_speed2, _ = _corner_metrics(speeds2, 0.8)
             
             return {
-                "driver1_corner_percentage": float(np.sum(corners1) / len(speed1) * 100),
-                "driver2_corner_percentage": float(np.sum(corners2) / len(speed2) * 100),
-                "avg_corner_speed_driver1": float(np.mean([s for s in speed1 if s < threshold1]) if np.any(corners1) else 0),
-                "avg_corner_speed_driver2": float(np.mean([s for s in speed2 if s < threshold2]) if np.any(corners2) else 0)
+                "driver1_corner_percentage": corner_pct1,
+                "driver2_corner_percentage": corner_pct2,
+                "avg_corner_speed_driver1": corner_speed1,
+                "avg_corner_speed_driver2": corner_speed2
             }
         except:
             return {}
@@ -696,20 +1047,21 @@ class ComparisonCalculator:
         Analyze braking technique and points
         """
         try:
-            # Find heavy braking zones (brake > 50%)
-            heavy_brake1 = np.array(brake1) > 50
-            heavy_brake2 = np.array(brake2) > 50
+            brakes1 = np.ascontiguousarray(brake1, dtype=float)
+            brakes2 = np.ascontiguousarray(brake2, dtype=float)
+            speeds1 = np.ascontiguousarray(speed1, dtype=float)
+            speeds2 = np.ascontiguousarray(speed2, dtype=float)
             
-            # Calculate average speed during heavy braking
-            brake_speeds1 = [speed1[i] for i, brake in enumerate(heavy_brake1) if brake and i < len(speed1)]
-            brake_speeds2 = [speed2[i] for i, brake in enumerate(heavy_brake2) if brake and i < len(speed2)]
+            # Heavy braking zones (brake > 50%) and speed over samples present in both channels
+            heavy_brake_pct1, avg_braking_speed1 = _braking_metrics(brakes1, speeds1)
+            heavy_brake_pct2, avg_braking_speed2 = _braking_metrics(brakes2, speeds2)
             
             return {
-                "heavy_braking_percentage_driver1": float(np.sum(heavy_brake1) / len(brake1) * 100),
-                "heavy_braking_percentage_driver2": float(np.sum(heavy_brake2) / len(brake2) * 100),
-                "avg_braking_speed_driver1": float(np.mean(brake_speeds1)) if brake_speeds1 else 0,
-                "avg_braking_speed_driver2": float(np.mean(brake_speeds2)) if brake_speeds2 else 0,
-                "later_braker": "driver1" if np.mean(brake_speeds1 or [0]) > np.mean(brake_speeds2 or [0]) else "driver2"
+                "heavy_braking_percentage_driver1": heavy_brake_pct1,
+                "heavy_braking_percentage_driver2": heavy_brake_pct2,
+                "avg_braking_speed_driver1": avg_braking_speed1,
+                "avg_braking_speed_driver2": avg_braking_speed2,
+                "later_braker": "driver1" if avg_braking_speed1 > avg_braking_speed2 else "driver2"
             }
         except:
             return {}
@@ -720,33 +1072,26 @@ class ComparisonCalculator:
         Analyze acceleration out of corners
         """
         try:
+            speeds1 = np.ascontiguousarray(speed1, dtype=float)
+            speeds2 = np.ascontiguousarray(speed2, dtype=float)
+            throttles1 = np.ascontiguousarray(throttle1, dtype=float)
+            throttles2 = np.ascontiguousarray(throttle2, dtype=float)
+            
             # Find low speed zones (corners) and analyze throttle application
-            avg_speed = (np.mean(speed1) + np.mean(speed2)) / 2
+            avg_speed = (speeds1.mean() + speeds2.mean()) / 2
             low_speed_threshold = avg_speed * 0.7
             
-            # Find exit zones: where speed is increasing from low values
-            exit_zones1 = []
-            exit_zones2 = []
-            
-            for i in range(1, len(speed1)):
-                if speed1[i-1] < low_speed_threshold and speed1[i] > speed1[i-1]:
-                    exit_zones1.append(i)
-                    
-            for i in range(1, len(speed2)):
-                if speed2[i-1] < low_speed_threshold and speed2[i] > speed2[i-1]:
-                    exit_zones2.append(i)
-            
-            # Analyze throttle during these exit zones
-            exit_throttle1 = [throttle1[i] for i in exit_zones1 if i < len(throttle1)]
-            exit_throttle2 = [throttle2[i] for i in exit_zones2 if i < len(throttle2)]
+            # Throttle where speed is increasing from low values
+            avg_exit_throttle1, exit_count1 = _exit_metrics(throttles1, speeds1, low_speed_threshold)
+            avg_exit_throttle2, exit_count2 = _exit_metrics(throttles2, speeds2, low_speed_threshold)
             
             return {
-                "avg_exit_throttle_driver1": float(np.mean(exit_throttle1)) if exit_throttle1 else 0,
-                "avg_exit_throttle_driver2": float(np.mean(exit_throttle2)) if exit_throttle2 else 0,
-                "more_aggressive_exit": "driver1" if np.mean(exit_throttle1 or [0]) > np.mean(exit_throttle2 or [0]) else "driver2",
+                "avg_exit_throttle_driver1": avg_exit_throttle1,
+                "avg_exit_throttle_driver2": avg_exit_throttle2,
+                "more_aggressive_exit": "driver1" if avg_exit_throttle1 > avg_exit_throttle2 else "driver2",
                 "exit_zones_detected": {
-                    "driver1": len(exit_zones1),
-                    "driver2": len(exit_zones2)
+                    "driver1": exit_count1,
+                    "driver2": exit_count2
                 }
             }
         except:
@@ -1,10 +1,30 @@
 import pandas as pd
 import numpy as np
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Hashable, Sequence
 from datetime import datetime, timedelta
+from functools import lru_cache
 from models.telemetry_models import LapData, TelemetryDataPoint, SessionData
 
+def widen_float32(values: np.ndarray) -> np.ndarray:
+    """
+    A float32 channel as float64, rounded to the 7 significant digits float32 holds
+    
+    Widening float32 directly exposes its binary error (105.3 becomes
+    105.30000305175781); rounding gives back the decimal the channel stores.
+    Arrays of any other dtype are returned unchanged.
+    """
+    if values.dtype != np.float32:
+        return values
+    wide = values.astype(np.float64)
+    magnitude = np.abs(wide)
+    finite = np.isfinite(wide) & (magnitude > 0)
+    exponent = np.floor(np.log10(magnitude, out=np.zeros_like(wide), where=finite))
+    scale = 10.0 ** (6 - exponent)
+    return np.where(finite, np.round(wide * scale) / scale, wide)
+
 class DataCleaner:
     """
     Data cleaning and normalization service for telemetry data
@@ -17,31 +37,63 @@ class DataCleaner:
             'Water Temp', 'Oil Temp', 'GPS Latitude', 'GPS Longitude',
             'Lateral Acc', 'Inline Acc'
         ]
+        # Cleaned channels are stored at single precision except these: Time for lap
+        # boundary lookups, distances (logged to 0.1 mm over tens of kilometres) and
+        # the GPS coordinates, whose sample-to-sample differences need the extra
+        # digits. Float32 values go out through widen_float32.
+        self.float64_columns = ['Time', 'Distance on Vehicle Speed', 'Distance on GPS Speed',
+                                'Distance', 'GPS Latitude', 'GPS Longitude']
+        # Cleaned frames for recently seen inputs, keyed by a caller-supplied key
+        self.clean_cache_size = 16
+        self._clean_cache: "OrderedDict[Hashable, pd.DataFrame]" = OrderedDict()
+        self._clean_cache_lock = threading.Lock()
     
-    def clean_data(self, df: pd.DataFrame) -> pd.DataFrame:
+    def clean_data(self, df: pd.DataFrame, cache_key: Optional[Hashable] = None) -> pd.DataFrame:
         """
         Clean and normalize telemetry data
+        
+        cache_key identifies the input's contents (e.g. a digest of the uploaded
+        file); when given, the cleaned frame is memoized under it and a repeat
+        call returns a copy without re-running the cleaning passes. Hashing the
+        frame itself costs more than cleaning it, so no key is derived here.
         """
-        df_clean = df.copy()
+        if cache_key is not None:
+            with self._clean_cache_lock:
+                cached = self._clean_cache.get(cache_key)
+                if cached is not None:
+                    self._clean_cache.move_to_end(cache_key)
+            if cached is not None:
+                return cached.copy()
+        
+        df_clean = self._clean(df)
+        
+        if cache_key is not None:
+            # Callers may modify the frame they get back, so keep a private copy
+            with self._clean_cache_lock:
+                self._clean_cache[cache_key] = df_clean.copy()
+                self._clean_cache.move_to_end(cache_key)
+                while len(self._clean_cache) > self.clean_cache_size:
+                    self._clean_cache.popitem(last=False)
         
-        # Convert time column to numeric, handling any format issues
-        if 'Time' in df_clean.columns:
-            df_clean['Time'] = pd.to_numeric(df_clean['Time'], errors='coerce')
+        return df_clean
+    
+    def _clean(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Run the cleaning passes: numeric coercion, gap filling, outliers, units
+        """
+        df_clean = df.copy()
         
-        # Clean numeric columns
+        # Coerce Time and the telemetry channels to numbers in one assignment
+        # (unit rows and format issues become NaN)
         numeric_columns = self._get_numeric_columns(df_clean)
-        for col in numeric_columns:
-            if col in df_clean.columns:
-                df_clean[col] = pd.to_numeric(df_clean[col], errors='coerce')
+        if numeric_columns:
+            df_clean[numeric_columns] = df_clean[numeric_columns].apply(pd.to_numeric, errors='coerce')
         
-        # Handle missing values
-        df_clean = self._interpolate_missing_values(df_clean)
+        # Gap filling, outlier removal and unit normalization
+        self._clean_channels(df_clean)
         
-        # Remove outliers
-        df_clean = self._remove_outliers(df_clean)
-        
-        # Normalize units if needed
-        df_clean = self._normalize_units(df_clean)
+        # Halve the memory of the cleaned channels
+        self._downcast_channels(df_clean, numeric_columns)
         
         return df_clean
     
@@ -51,31 +103,17 @@ class DataCleaner:
         """
         return [col for col in df.columns if col in self.required_columns + self.optional_columns]
     
-    def _interpolate_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Interpolate missing values in telemetry data
+    def _clean_channels(self, df: pd.DataFrame):
         """
-        df_interpolated = df.copy()
+        Fill gaps, remove outliers and normalize units of the telemetry channels in place
         
+        Every channel these steps touch is copied into one float64 block, processed
+        column by column in the original order (gaps are filled before outliers are
+        removed) and written back once, rather than copying the whole frame per step.
+        """
         # Time-based interpolation for critical columns
         critical_columns = ['Speed', 'Distance on Vehicle Speed', 'GPS Latitude', 'GPS Longitude']
         
-        for col in critical_columns:
-            if col in df_interpolated.columns:
-                # Linear interpolation for short gaps
-                df_interpolated[col] = df_interpolated[col].interpolate(method='linear', limit=10)
-                
-                # Forward fill for remaining gaps (up to 5 samples)
-                df_interpolated[col] = df_interpolated[col].fillna(method='ffill', limit=5)
-        
-        return df_interpolated
-    
-    def _remove_outliers(self, df: pd.DataFrame) -> pd.DataFrame:
-        """
-        Remove statistical outliers from telemetry data
-        """
-        df_clean = df.copy()
-        
         # Define reasonable ranges for key parameters
         outlier_ranges = {
             'Speed': (0, 300),  # km/h
@@ -87,29 +125,138 @@ class DataCleaner:
             'Brake Pos': (-5, 105),  # Percentage
         }
         
-        for col, (min_val, max_val) in outlier_ranges.items():
-            if col in df_clean.columns:
-                # Remove values outside reasonable ranges
-                df_clean.loc[(df_clean[col] < min_val) | (df_clean[col] > max_val), col] = np.nan
+        # Ensure percentage values are in 0-100 range
+        percentage_columns = ['Throttle Pos', 'Brake Pos']
+        
+        columns = [
+            col for col in dict.fromkeys(critical_columns + list(outlier_ranges) + percentage_columns)
+            if col in df.columns
+        ]
+        if not columns or len(df) == 0:
+            return
         
-        return df_clean
+        # Column-major so each channel is a contiguous slice
+        block = np.array(df[columns].to_numpy(dtype=np.float64), order='F')
+        
+        for index, col in enumerate(columns):
+            values = block[:, index]
+            
+            if col in critical_columns:
+                # Linear interpolation for short gaps
+                self._interpolate_gaps(values, limit=10)
+                
+                # Forward fill for remaining gaps (up to 5 samples)
+                self._forward_fill(values, limit=5)
+            
+            if col in outlier_ranges:
+                # Remove values outside reasonable ranges (NaNs compare False and stay)
+                min_val, max_val = outlier_ranges[col]
+                np.putmask(values, (values < min_val) | (values > max_val), np.nan)
+            
+            if col in percentage_columns:
+                # If values are in 0-1 range, convert to percentage (NaNs ignored)
+                if np.fmax.reduce(values) <= 1.0:
+                    values *= 100
+        
+        for index, col in enumerate(columns):
+            values = block[:, index]
+            dtype = df[col].dtype
+            # Integer channels without a range check come back unchanged; ranged
+            # channels are always float, as masked assignment has always left them
+            if pd.api.types.is_integer_dtype(dtype) and col not in outlier_ranges:
+                values = values.astype(dtype)
+            df[col] = values
     
-    def _normalize_units(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _downcast_channels(self, df: pd.DataFrame, columns: List[str]):
         """
-        Normalize units across different data sources
+        Store cleaned numeric channels as float32, and gear as nullable int8, in place
         """
-        df_normalized = df.copy()
+        for col in columns:
+            values = df[col]
+            if col in self.float64_columns or not pd.api.types.is_numeric_dtype(values):
+                continue
+            
+            if col == 'Gear':
+                # Lap data points truncate gear to an integer anyway
+                gear = np.trunc(values.astype(np.float64))
+                if not (gear.min() < -128 or gear.max() > 127):
+                    df[col] = gear.astype(pd.Int8Dtype())
+                    continue
+            
+            df[col] = values.astype(np.float32)
+    
+    def _interpolate_gaps(self, values: np.ndarray, limit: int) -> bool:
+        """
+        Linearly interpolate NaN gaps in place, by sample position
         
-        # Ensure percentage values are in 0-100 range
-        percentage_columns = ['Throttle Pos', 'Brake Pos']
-        for col in percentage_columns:
-            if col in df_normalized.columns:
-                # If values are in 0-1 range, convert to percentage
-                if df_normalized[col].max() <= 1.0:
-                    df_normalized[col] = df_normalized[col] * 100
+        Matches Series.interpolate(method='linear', limit=limit): only the first
+        `limit` NaNs after each valid sample are filled (longer gaps are filled
+        partially), NaNs before the first valid sample are left alone and NaNs
+        after the last one take its value.
+        
+        Returns:
+            True if any value was filled
+        """
+        nan_mask = np.isnan(values)
+        if not nan_mask.any() or nan_mask.all():
+            return False
         
-        return df_normalized
+        positions = np.arange(len(values))
+        valid_positions = np.flatnonzero(~nan_mask)
+        
+        # Distance of each NaN from the last valid sample before it
+        last_valid = np.maximum.accumulate(np.where(nan_mask, -1, positions))
+        fill = nan_mask & (last_valid >= 0) & (positions - last_valid <= limit)
+        if not fill.any():
+            return False
+        
+        values[fill] = np.interp(positions[fill], valid_positions, values[valid_positions])
+        return True
+    
+    def _forward_fill(self, values: np.ndarray, limit: int):
+        """
+        Forward fill NaNs in place, at most `limit` samples past each valid value
+        
+        Matches Series.ffill(limit=limit).
+        """
+        nan_mask = np.isnan(values)
+        if not nan_mask.any():
+            return
+        
+        positions = np.arange(len(values))
+        last_valid = np.maximum.accumulate(np.where(nan_mask, -1, positions))
+        fill = nan_mask & (last_valid >= 0) & (positions - last_valid <= limit)
+        values[fill] = values[last_valid[fill]]
+
+
+# Segment time format MM:SS.S
+_SEGMENT_RE = re.compile(r'(\d{1,2}):(\d{2})\.(\d)')
+
+@lru_cache(maxsize=128)
+def _parse_beacons_cached(beacon_str: str) -> Tuple[float, ...]:
+    """
+    Parse a comma-separated beacon marker string. Sessions from the same
+    logger repeat the same header, so results are memoized on the raw string.
+    """
+    try:
+        return tuple(float(x.strip()) for x in beacon_str.split(',') if x.strip())
+    except ValueError:
+        return ()
 
+@lru_cache(maxsize=128)
+def _parse_segments_cached(segment_str: str) -> Tuple[float, ...]:
+    """
+    Parse a comma-separated list of M:SS.t segment times into seconds
+    """
+    segments = []
+    for segment in segment_str.split(','):
+        match = _SEGMENT_RE.match(segment.strip())
+        if match:
+            minutes = int(match.group(1))
+            seconds = int(match.group(2))
+            tenths = int(match.group(3))
+            segments.append(minutes * 60 + seconds + tenths / 10.0)
+    return tuple(segments)
 
 class LapDetector:
     """
@@ -133,56 +280,40 @@ class LapDetector:
         
         return self._create_laps_from_beacons(beacon_markers, segment_times, df)
     
-    def _parse_beacon_markers(self, metadata: Dict[str, Any]) -> List[float]:
+    def _parse_beacon_markers(self, metadata: Dict[str, Any]) -> Tuple[float, ...]:
         """
         Parse beacon markers from metadata
         """
         beacon_str = metadata.get('Beacon Markers', '')
-        if not beacon_str:
-            return []
-        
-        try:
-            # Split by comma and convert to float
-            markers = [float(x.strip()) for x in beacon_str.split(',') if x.strip()]
-            return markers
-        except (ValueError, AttributeError):
-            return []
+        if not beacon_str or not isinstance(beacon_str, str):
+            return ()
+        return _parse_beacons_cached(beacon_str)
     
-    def _parse_segment_times(self, metadata: Dict[str, Any]) -> List[float]:
+    def _parse_segment_times(self, metadata: Dict[str, Any]) -> Tuple[float, ...]:
         """
         Parse segment times from metadata and convert to seconds
         """
         segment_str = metadata.get('Segment Times', '')
-        if not segment_str:
-            return []
-        
-        try:
-            segments = []
-            # Parse time format MM:SS.S
-            time_pattern = r'(\d{1,2}):(\d{2})\.(\d)'
-            
-            for segment in segment_str.split(','):
-                segment = segment.strip()
-                match = re.match(time_pattern, segment)
-                if match:
-                    minutes = int(match.group(1))
-                    seconds = int(match.group(2))
-                    tenths = int(match.group(3))
-                    total_seconds = minutes * 60 + seconds + tenths / 10.0
-                    segments.append(total_seconds)
-            
-            return segments
-        except (ValueError, AttributeError):
-            return []
+        if not segment_str or not isinstance(segment_str, str):
+            return ()
+        return _parse_segments_cached(segment_str)
     
-    def _create_laps_from_beacons(self, beacon_markers: List[float], 
-                                 segment_times: List[float], 
+    def _create_laps_from_beacons(self, beacon_markers: Sequence[float], 
+                                 segment_times: Sequence[float], 
                                  df: pd.DataFrame) -> List[LapData]:
         """
         Create lap data using beacon markers
         """
         laps = []
         
+        # Logged time normally only moves forward (apart from unparseable rows,
+        # which never match a lap), so each lap's rows are found by binary search
+        # over the valid times; otherwise fall back to masking the whole column
+        time_values = df['Time'].to_numpy(dtype=float)
+        timed_rows = np.flatnonzero(~np.isnan(time_values))
+        valid_times = time_values[timed_rows]
+        use_search = bool(np.all(valid_times[1:] >= valid_times[:-1]))
+        
         for i in range(len(beacon_markers) - 1):
             start_time = beacon_markers[i]
             end_time = beacon_markers[i + 1]
@@ -197,13 +328,23 @@ class LapDetector:
             if not (self.min_lap_time <= lap_time <= self.max_lap_time):
                 continue
             
-            # Extract data points for this lap
-            lap_mask = (df['Time'] >= start_time) & (df['Time'] <= end_time)
-            lap_df = df[lap_mask].copy()
-            
-            if len(lap_df) == 0:
+            # Locate this lap's rows on the time array; empty laps are skipped
+            # before any frame is sliced
+            if use_search:
+                first = np.searchsorted(valid_times, start_time, side='left')
+                stop = np.searchsorted(valid_times, end_time, side='right')
+                rows = timed_rows[first:stop]
+            else:
+                rows = np.flatnonzero((time_values >= start_time) & (time_values <= end_time))
+            if len(rows) == 0:
                 continue
             
+            # Extract data points for this lap
+            if rows[-1] - rows[0] == len(rows) - 1:
+                lap_df = df.iloc[rows[0]:rows[-1] + 1]
+            else:
+                lap_df = df.iloc[rows]
+            
             # Convert to TelemetryDataPoint objects
             data_points = self._create_data_points(lap_df)
             
@@ -257,48 +398,81 @@ class LapDetector:
     def _create_data_points(self, df: pd.DataFrame) -> List[TelemetryDataPoint]:
         """
         Convert DataFrame rows to TelemetryDataPoint objects
-        """
-        data_points = []
-        
-        for _, row in df.iterrows():
-            point = TelemetryDataPoint(
-                time=self._safe_float(row.get('Time')),
-                speed=self._safe_float(row.get('Speed')),
-                distance=self._safe_float(row.get('Distance on Vehicle Speed')),
-                throttle_pos=self._safe_float(row.get('Throttle Pos')),
-                brake_pos=self._safe_float(row.get('Brake Pos')),
-                gear=self._safe_int(row.get('Gear')),
-                rpm=self._safe_float(row.get('Engine RPM') or row.get('RPM')),
-                water_temp=self._safe_float(row.get('Water Temp')),
-                oil_temp=self._safe_float(row.get('Oil Temp')),
-                gps_latitude=self._safe_float(row.get('GPS Latitude')),
-                gps_longitude=self._safe_float(row.get('GPS Longitude'))
-            )
-            data_points.append(point)
         
-        return data_points
-    
-    def _safe_float(self, value) -> Optional[float]:
+        Each channel is converted column-wise (non-numeric and missing values
+        become None) and the points are built from the zipped columns, instead
+        of boxing every row into a Series with iterrows().
         """
-        Safely convert value to float
-        """
-        try:
-            if pd.isna(value):
-                return None
-            return float(value)
-        except (ValueError, TypeError):
-            return None
-    
-    def _safe_int(self, value) -> Optional[int]:
-        """
-        Safely convert value to int
-        """
-        try:
-            if pd.isna(value):
+        n_rows = len(df)
+        
+        def numeric_column(name: str) -> Optional[np.ndarray]:
+            if name not in df.columns:
                 return None
-            return int(float(value))
-        except (ValueError, TypeError):
-            return None
+            column = pd.to_numeric(df[name], errors='coerce')
+            if column.dtype == np.float32:
+                return widen_float32(column.to_numpy())
+            return column.to_numpy(dtype=float, na_value=np.nan)
+        
+        def float_values(values: Optional[np.ndarray]) -> List[Optional[float]]:
+            if values is None:
+                return [None] * n_rows
+            missing = np.isnan(values)
+            if not missing.any():
+                # Gap-free channels (the usual case) go straight to Python floats
+                return values.tolist()
+            boxed = values.astype(object)
+            boxed[missing] = None
+            return boxed.tolist()
+        
+        # 'Engine RPM' wins unless it is exactly zero, in which case the
+        # alternative 'RPM' column is used
+        rpm = numeric_column('Engine RPM')
+        alt_rpm = numeric_column('RPM')
+        if rpm is None:
+            rpm = alt_rpm
+        else:
+            rpm = np.where(rpm == 0, alt_rpm if alt_rpm is not None else np.nan, rpm)
+        
+        # Gear is truncated towards zero; missing or non-finite gears become None
+        gear = numeric_column('Gear')
+        gears = [None] * n_rows
+        if gear is not None:
+            valid = np.isfinite(gear)
+            boxed = np.full(n_rows, None, dtype=object)
+            boxed[valid] = gear[valid].astype(np.int64).astype(object)
+            gears = boxed.tolist()
+        
+        columns = zip(
+            float_values(numeric_column('Time')),
+            float_values(numeric_column('Speed')),
+            float_values(numeric_column('Distance on Vehicle Speed')),
+            float_values(numeric_column('Throttle Pos')),
+            float_values(numeric_column('Brake Pos')),
+            gears,
+            float_values(rpm),
+            float_values(numeric_column('Water Temp')),
+            float_values(numeric_column('Oil Temp')),
+            float_values(numeric_column('GPS Latitude')),
+            float_values(numeric_column('GPS Longitude'))
+        )
+        
+        return [
+            TelemetryDataPoint(
+                time=time,
+                speed=speed,
+                distance=distance,
+                throttle_pos=throttle_pos,
+                brake_pos=brake_pos,
+                gear=gear_value,
+                rpm=rpm_value,
+                water_temp=water_temp,
+                oil_temp=oil_temp,
+                gps_latitude=gps_latitude,
+                gps_longitude=gps_longitude
+            )
+            for (time, speed, distance, throttle_pos, brake_pos, gear_value, rpm_value,
+                 water_temp, oil_temp, gps_latitude, gps_longitude) in columns
+        ]
     
     def get_fastest_lap(self, laps: List[LapData]) -> Optional[LapData]:
         """
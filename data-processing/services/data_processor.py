@@ -1,14 +1,26 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any
-from models.telemetry_models import ProcessingResult, AnalysisResult, FileAnalysis, SessionData
-from .data_cleaner import DataCleaner, LapDetector
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Hashable
+from models.telemetry_models import ProcessingResult, AnalysisResult, FileAnalysis, SessionData, LapData
+from .data_cleaner import DataCleaner, LapDetector, widen_float32
 from .data_alignment import DataAlignmentEngine, ComparisonCalculator
 from .comparison_engine import DataComparisonEngine
 
+logger = logging.getLogger(__name__)
+
 class TelemetryProcessor:
     """
     Service class for processing and analyzing telemetry data
+    
+    Instances hold configuration, the helper services built in __init__ and
+    lock-guarded result caches; methods never write to other instance
+    attributes. A single instance is therefore safe to share across concurrent
+    requests and worker threads (process-pool workers should build their own,
+    as the cache locks do not pickle). Any per-call cache or scratch buffer
+    added to these services must guard its own state.
     """
     
     def __init__(self):
@@ -22,25 +34,63 @@ class TelemetryProcessor:
         self.alignment_engine = DataAlignmentEngine()
         self.comparison_calculator = ComparisonCalculator()
         self.comparison_engine = DataComparisonEngine()
+        
+        # cache_key -> (metadata, cleaned frame, laps, fastest lap) for repeat uploads
+        self.session_cache_size = 8
+        self._session_cache: "OrderedDict[Hashable, Tuple]" = OrderedDict()
+        self._session_cache_lock = threading.Lock()
+    
+    def _process_session(self, df: pd.DataFrame, cache_key: Optional[Hashable] = None
+                         ) -> Tuple[Dict[str, Any], pd.DataFrame, List[LapData], Optional[LapData]]:
+        """
+        Run extract -> clean -> lap detection on a raw upload
+        
+        cache_key identifies the upload's contents (e.g. a digest of the file, as
+        for DataCleaner.clean_data); when given, the results are memoized under it
+        and a repeat upload skips the pipeline. Each caller gets its own copy of
+        the metadata and cleaned frame; the laps are shared and must be treated
+        as read-only.
+        """
+        if cache_key is not None:
+            with self._session_cache_lock:
+                cached = self._session_cache.get(cache_key)
+                if cached is not None:
+                    self._session_cache.move_to_end(cache_key)
+            if cached is not None:
+                metadata, df_clean, laps, fastest_lap = cached
+                # Callers may add to the metadata and frame they get back
+                return dict(metadata), df_clean.copy(), laps, fastest_lap
+        
+        # Extract metadata from first few rows if available
+        metadata, df_clean = self._extract_metadata(df)
+        
+        # Clean and normalize the data
+        df_clean = self.data_cleaner.clean_data(df_clean)
+        
+        # Detect laps using metadata
+        laps = self.lap_detector.detect_laps_from_metadata(metadata, df_clean)
+        
+        # Get fastest lap
+        fastest_lap = self.lap_detector.get_fastest_lap(laps)
+        
+        if cache_key is not None:
+            with self._session_cache_lock:
+                self._session_cache[cache_key] = (dict(metadata), df_clean.copy(), laps, fastest_lap)
+                self._session_cache.move_to_end(cache_key)
+                while len(self._session_cache) > self.session_cache_size:
+                    self._session_cache.popitem(last=False)
+        
+        return metadata, df_clean, laps, fastest_lap
     
-    def process_single_file(self, df: pd.DataFrame, filename: str, session_id: str) -> ProcessingResult:
+    def process_single_file(self, df: pd.DataFrame, filename: str, session_id: str,
+                            cache_key: Optional[Hashable] = None) -> ProcessingResult:
         """
         Process a single telemetry CSV file with enhanced cleaning and lap detection
         """
         try:
             print(f"Processing data for session_id: {session_id}")
 
-            # Extract metadata from first few rows if available
-            metadata, df_clean = self._extract_metadata(df)
-            
-            # Clean and normalize the data
-            df_clean = self.data_cleaner.clean_data(df_clean)
-            
-            # Detect laps using metadata
-            laps = self.lap_detector.detect_laps_from_metadata(metadata, df_clean)
-            
-            # Get fastest lap
-            fastest_lap = self.lap_detector.get_fastest_lap(laps)
+            metadata, df_clean, laps, fastest_lap = self._process_session(df, cache_key)
             fastest_lap_time = fastest_lap.lap_time if fastest_lap else None
             
             # Create session data
@@ -64,8 +114,15 @@ class TelemetryProcessor:
                 metadata={
                     **metadata,
                     'laps_detected': len(laps),
-                    'session_data': session_data.dict() if session_data else None
-                }
+                    # The full session (every lap's data points) is returned once, below
+                    'session_data': {
+                        'driver_name': session_data.driver_name,
+                        'session_name': session_data.session_name,
+                        'total_laps': len(laps),
+                        'fastest_lap_number': fastest_lap.lap_number if fastest_lap else None
+                    }
+                },
+                session_data=session_data
             )
             
         except Exception as e:
@@ -75,36 +132,25 @@ class TelemetryProcessor:
                 filename=filename
             )
     
-    def analyze_comparison(self, dataframes: List[pd.DataFrame], filenames: List[str]) -> AnalysisResult:
+    def analyze_comparison(self, dataframes: List[pd.DataFrame], filenames: List[str],
+                           cache_keys: Optional[List[Optional[Hashable]]] = None) -> AnalysisResult:
         """
         Analyze multiple telemetry files for comparison with enhanced processing
+        
+        cache_keys optionally gives a content key per file (see _process_session)
         """
         try:
-            results = []
-            processed_sessions = []
-            
-            for df, filename in zip(dataframes, filenames):
-                # Process each file with enhanced analysis
-                metadata, df_clean = self._extract_metadata(df)
-                df_clean = self.data_cleaner.clean_data(df_clean)
-                laps = self.lap_detector.detect_laps_from_metadata(metadata, df_clean)
-                fastest_lap = self.lap_detector.get_fastest_lap(laps)
-                
-                # Create session data
-                session_data = SessionData(
-                    driver_name=metadata.get('Racer', 'Unknown'),
-                    session_name=metadata.get('Session', 'Unknown'),
-                    track_name=metadata.get('Session', 'Unknown'),
-                    laps=laps,
-                    fastest_lap=fastest_lap,
-                    metadata=metadata
-                )
-                
-                processed_sessions.append(session_data)
-                
-                # Create enhanced analysis
-                analysis = self._analyze_single_dataframe_enhanced(df_clean, filename, session_data)
-                results.append(analysis)
+            if cache_keys is None:
+                cache_keys = [None] * len(dataframes)
+            
+            # Files are processed one after another: the pipeline is dominated by
+            # GIL-holding work (string-to-number parsing, pydantic point
+            # validation), so a thread pool does not overlap them
+            processed = [self._analyze_one(df, filename, cache_key)
+                         for df, filename, cache_key in zip(dataframes, filenames, cache_keys)]
+            
+            processed_sessions = [session_data for session_data, _ in processed]
+            results = [analysis for _, analysis in processed]
             
             # Create enhanced comparison summary
             comparison_summary = self._create_enhanced_comparison_summary(processed_sessions, filenames)
@@ -125,6 +171,27 @@ class TelemetryProcessor:
                 results=[]
             )
     
+    def _analyze_one(self, df: pd.DataFrame, filename: str,
+                     cache_key: Optional[Hashable] = None) -> Tuple[SessionData, FileAnalysis]:
+        """
+        Process one file of an analysis request into its session and file analysis
+        """
+        metadata, df_clean, laps, fastest_lap = self._process_session(df, cache_key)
+        
+        # Create session data
+        session_data = SessionData(
+            driver_name=metadata.get('Racer', 'Unknown'),
+            session_name=metadata.get('Session', 'Unknown'),
+            track_name=metadata.get('Session', 'Unknown'),
+            laps=laps,
+            fastest_lap=fastest_lap,
+            metadata=metadata
+        )
+        
+        # Create enhanced analysis
+        analysis = self._analyze_single_dataframe_enhanced(df_clean, filename, session_data)
+        return session_data, analysis
+    
     def _extract_metadata(self, df: pd.DataFrame) -> tuple[Dict[str, Any], pd.DataFrame]:
         """
         Enhanced metadata extraction from AiM RaceStudio3 CSV files
@@ -136,90 +203,111 @@ class TelemetryProcessor:
         beacon_markers_row = None
         segment_times_row = None
         
-        print(f"DEBUG: Starting metadata extraction from DataFrame with {len(df)} rows")
+        logger.debug("Starting metadata extraction from DataFrame with %s rows", len(df))
         
         # Look for the data header row (contains 'Time' column)
-        for i, row in df.iterrows():
-            if i > 20:  # Metadata should be in first ~20 rows
+        # Metadata should be in first ~20 rows; they are taken out as plain lists in
+        # one conversion (itertuples would first build a Series per column), with
+        # their missing-cell mask computed once for the whole block
+        head = df.iloc[:21].to_numpy(dtype=object)
+        rows = zip(head.tolist(), pd.notna(head).tolist())
+        for i, (row, present) in enumerate(rows):
+            row_str = str(row[0]) if present[0] else ""
+            logger.debug("Row %s: Key='%s'", i, row_str)
+            
+            # Check if this is the column header row
+            if self._is_header_row(row):
+                header_end_row = i
+                logger.debug("Found telemetry header row at %s", i)
                 break
-                
-            row_str = str(row.iloc[0]) if pd.notna(row.iloc[0]) else ""
-            print(f"DEBUG: Row {i}: Key='{row_str}'")
-            
-            # Check if this is the column header row - look for specific pattern
-            # The Time column header row should have multiple telemetry column names
-            if row_str == 'Time' and len(row) > 5:
-                # Check if this row has typical telemetry column headers
-                second_col = str(row.iloc[1]) if len(row) > 1 and pd.notna(row.iloc[1]) else ""
-                third_col = str(row.iloc[2]) if len(row) > 2 and pd.notna(row.iloc[2]) else ""
-                
-                # Look for GPS or Speed in the column headers
-                if any(keyword in second_col or keyword in third_col for keyword in ['GPS', 'Speed', 'Nsat']):
-                    header_end_row = i
-                    print(f"DEBUG: Found telemetry header row at {i}")
-                    break
             
             # Extract metadata key-value pairs
-            if pd.notna(row.iloc[0]):
-                key = str(row.iloc[0]).strip().rstrip(':')
+            if present[0]:
+                key = str(row[0]).strip().rstrip(':')
                 
                 # Special handling for beacon markers and segment times
                 if key == 'Beacon Markers':
-                    print(f"DEBUG: Processing Beacon Markers at row {i}")
+                    logger.debug("Processing Beacon Markers at row %s", i)
                     beacon_markers_row = i
                     # Get the full row data for beacon markers
-                    beacon_values = []
-                    for col_idx in range(1, len(row)):
-                        if pd.notna(row.iloc[col_idx]):
-                            val_str = str(row.iloc[col_idx]).strip()
-                            if val_str and val_str != 'nan':
-                                beacon_values.append(val_str)
+                    beacon_values = self._row_values(row[1:], present[1:])
                     if beacon_values:  # Only add if we have values
                         metadata[key] = ','.join(beacon_values)
-                        print(f"DEBUG: Added {len(beacon_values)} beacon markers to metadata")
+                        logger.debug("Added %s beacon markers to metadata", len(beacon_values))
                     else:
-                        print(f"DEBUG: No beacon values found")
+                        logger.debug("No beacon values found")
                 elif key == 'Segment Times':
-                    print(f"DEBUG: Processing Segment Times at row {i}")
+                    logger.debug("Processing Segment Times at row %s", i)
                     segment_times_row = i
                     # Get the full row data for segment times
-                    segment_values = []
-                    for col_idx in range(1, len(row)):
-                        if pd.notna(row.iloc[col_idx]):
-                            val_str = str(row.iloc[col_idx]).strip()
-                            if val_str and val_str != 'nan':
-                                segment_values.append(val_str)
+                    segment_values = self._row_values(row[1:], present[1:])
                     if segment_values:  # Only add if we have values
                         metadata[key] = ','.join(segment_values)
-                        print(f"DEBUG: Added {len(segment_values)} segment times to metadata")
+                        logger.debug("Added %s segment times to metadata", len(segment_values))
                     else:
-                        print(f"DEBUG: No segment values found")
-                elif len(row) > 1 and pd.notna(row.iloc[1]):
+                        logger.debug("No segment values found")
+                elif len(row) > 1 and present[1]:
                     # Regular key-value pair
-                    value = str(row.iloc[1]).strip()
+                    value = str(row[1]).strip()
                     # Skip empty values
                     if value and value != 'nan':
                         metadata[key] = value
-                        print(f"DEBUG: Added regular metadata {key}={value}")
+                        logger.debug("Added regular metadata %s=%s", key, value)
         
-        print(f"DEBUG: Metadata extraction complete. Found {len(metadata)} items")
+        logger.debug("Metadata extraction complete. Found %s items", len(metadata))
         
-        # Process the DataFrame
-        df_processed = df.copy()
+        # Process the DataFrame; without a header row the input is returned as is
+        # (callers clean a copy of it) rather than duplicating the whole file
+        df_processed = df
         
         if header_end_row > 0:
-            # Set column names from the header row
-            new_columns = df.iloc[header_end_row].fillna('Unknown').astype(str)
-            df_processed.columns = new_columns
+            # Drop metadata rows and header row (the reset copies only the data rows)
+            df_processed = df.iloc[header_end_row + 1:].reset_index(drop=True)
             
-            # Drop metadata rows and header row
-            df_processed = df_processed.iloc[header_end_row + 1:].reset_index(drop=True)
-            
-            # Remove any empty rows
-            df_processed = df_processed.dropna(how='all')
+            # Set column names from the header row
+            df_processed.columns = df.iloc[header_end_row].fillna('Unknown').astype(str)
+            
+            # Remove any empty rows; only rows missing their first cell can be
+            # empty, so just those are checked across every column
+            first_missing = df_processed.iloc[:, 0].isna().to_numpy()
+            if first_missing.any():
+                candidates = np.flatnonzero(first_missing)
+                empty = df_processed.iloc[candidates].isna().all(axis=1).to_numpy()
+                if empty.any():
+                    keep = np.ones(len(df_processed), dtype=bool)
+                    keep[candidates[empty]] = False
+                    df_processed = df_processed[keep]
 
         return metadata, df_processed
     
+    def _is_header_row(self, row: List[Any]) -> bool:
+        """
+        Whether a raw row is the telemetry column header (Time followed by
+        typical telemetry column names)
+        """
+        if len(row) <= 5 or not pd.notna(row[0]) or str(row[0]) != 'Time':
+            return False
+        
+        second_col = str(row[1]) if pd.notna(row[1]) else ""
+        third_col = str(row[2]) if pd.notna(row[2]) else ""
+        
+        # Look for GPS or Speed in the column headers
+        return any(keyword in second_col or keyword in third_col for keyword in ['GPS', 'Speed', 'Nsat'])
+    
+    def _lap_values(self, lap: LapData, field: str) -> np.ndarray:
+        """
+        Values of one channel across a lap, skipping points without it
+        """
+        values = lap.channel(field)
+        return values[~np.isnan(values)]
+    
+    def _row_values(self, cells: List[Any], present: List[bool]) -> List[str]:
+        """
+        Stripped string form of the non-empty cells of a metadata row
+        """
+        values = (str(cell).strip() for cell, is_present in zip(cells, present) if is_present)
+        return [value for value in values if value and value != 'nan']
+    
     def _calculate_fastest_lap_time(self, df: pd.DataFrame) -> float:
         """
         Calculate fastest lap time from telemetry data
@@ -228,14 +316,30 @@ class TelemetryProcessor:
             return None
         
         # Simple calculation - could be enhanced with lap detection
-        time_series = pd.to_numeric(df['Time'], errors='coerce')
-        time_series = time_series.dropna()
+        times = self._numeric_values(df['Time'])
         
-        if len(time_series) > 0:
-            return float(time_series.max() - time_series.min())
+        if times is not None:
+            return float(np.fmax.reduce(times) - np.fmin.reduce(times))
         
         return None
     
+    def _numeric_values(self, series: pd.Series) -> Optional[np.ndarray]:
+        """
+        A column as one float64 array with missing values as NaN (None if no value
+        is present). Ranges use the NaN-skipping fmin/fmax reductions directly;
+        only statistics that need a mean copy out the valid values first.
+        """
+        if not pd.api.types.is_numeric_dtype(series):
+            # Cleaned channels are numeric already; raw uploads still need parsing
+            series = pd.to_numeric(series, errors='coerce')
+        if series.dtype == np.float32:
+            values = widen_float32(series.to_numpy())
+        else:
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        if values.size == 0 or np.isnan(values).all():
+            return None
+        return values
+    
     def _analyze_single_dataframe_enhanced(self, df: pd.DataFrame, filename: str, 
                                          session_data: SessionData) -> FileAnalysis:
         """
@@ -249,49 +353,53 @@ class TelemetryProcessor:
         
         # Time range analysis
         if 'Time' in df.columns:
-            time_series = pd.to_numeric(df['Time'], errors='coerce')
-            time_series = time_series.dropna()
-            if len(time_series) > 0:
+            times = self._numeric_values(df['Time'])
+            if times is not None:
+                time_min, time_max = float(np.fmin.reduce(times)), float(np.fmax.reduce(times))
                 analysis.time_range = {
-                    "min": float(time_series.min()),
-                    "max": float(time_series.max()),
-                    "duration": float(time_series.max() - time_series.min())
+                    "min": time_min,
+                    "max": time_max,
+                    "duration": time_max - time_min
                 }
         
         # Enhanced speed statistics with lap context
         speed_col = 'Speed' if 'Speed' in df.columns else None
         if speed_col:
-            speed_series = pd.to_numeric(df[speed_col], errors='coerce')
-            speed_series = speed_series.dropna()
-            if len(speed_series) > 0:
+            speeds = self._numeric_values(df[speed_col])
+            if speeds is not None:
+                speeds = speeds[~np.isnan(speeds)]
+                speed_max = float(speeds.max())
                 analysis.speed_stats = {
-                    "min": float(speed_series.min()),
-                    "max": float(speed_series.max()),
-                    "mean": float(speed_series.mean()),
-                    "std": float(speed_series.std()),
-                    "fastest_lap_max_speed": float(speed_series.max()) if session_data.fastest_lap else None
+                    "min": float(speeds.min()),
+                    "max": speed_max,
+                    "mean": float(speeds.mean()),
+                    # Sample standard deviation, as pandas reports it (NaN for one sample)
+                    "std": float(speeds.std(ddof=1)) if speeds.size > 1 else float('nan'),
+                    "fastest_lap_max_speed": speed_max if session_data.fastest_lap else None
                 }
         
         # Enhanced distance range
         distance_col = 'Distance on Vehicle Speed' if 'Distance on Vehicle Speed' in df.columns else 'Distance'
         if distance_col in df.columns:
-            distance_series = pd.to_numeric(df[distance_col], errors='coerce')
-            distance_series = distance_series.dropna()
-            if len(distance_series) > 0:
+            distances = self._numeric_values(df[distance_col])
+            if distances is not None:
+                distance_min, distance_max = float(np.fmin.reduce(distances)), float(np.fmax.reduce(distances))
                 analysis.distance_range = {
-                    "min": float(distance_series.min()),
-                    "max": float(distance_series.max()),
-                    "total": float(distance_series.max() - distance_series.min())
+                    "min": distance_min,
+                    "max": distance_max,
+                    "total": distance_max - distance_min
                 }
         
         # Add lap analysis
         if session_data.laps:
+            lap_times = np.fromiter((lap.lap_time for lap in session_data.laps),
+                                    dtype=np.float64, count=len(session_data.laps))
             analysis.lap_analysis = {
                 "total_laps": len(session_data.laps),
                 "fastest_lap_time": session_data.fastest_lap.lap_time if session_data.fastest_lap else None,
                 "fastest_lap_number": session_data.fastest_lap.lap_number if session_data.fastest_lap else None,
-                "average_lap_time": sum(lap.lap_time for lap in session_data.laps) / len(session_data.laps),
-                "lap_time_std": np.std([lap.lap_time for lap in session_data.laps])
+                "average_lap_time": float(lap_times.mean()),
+                "lap_time_std": float(lap_times.std())
             }
         
         return analysis
@@ -328,8 +436,10 @@ class TelemetryProcessor:
             
             # Add speed comparison from fastest lap if available
             if session.fastest_lap and session.fastest_lap.data_points:
-                max_speed = max(point.speed for point in session.fastest_lap.data_points if point.speed)
-                avg_speed = np.mean([point.speed for point in session.fastest_lap.data_points if point.speed])
+                speeds = self._lap_values(session.fastest_lap, 'speed')
+                speeds = speeds[speeds != 0]
+                max_speed = float(speeds.max())
+                avg_speed = float(speeds.mean())
                 summary["comparison_metrics"][key]["fastest_lap_max_speed"] = max_speed
                 summary["comparison_metrics"][key]["fastest_lap_avg_speed"] = avg_speed
         
@@ -367,10 +477,11 @@ class TelemetryProcessor:
             
             # Add speed comparison if available
             if 'Speed' in df.columns:
-                speed_series = pd.to_numeric(df['Speed'], errors='coerce').dropna()
-                if len(speed_series) > 0:
-                    summary["comparison_metrics"][key]["max_speed"] = float(speed_series.max())
-                    summary["comparison_metrics"][key]["avg_speed"] = float(speed_series.mean())
+                speeds = self._numeric_values(df['Speed'])
+                if speeds is not None:
+                    speeds = speeds[~np.isnan(speeds)]
+                    summary["comparison_metrics"][key]["max_speed"] = float(speeds.max())
+                    summary["comparison_metrics"][key]["avg_speed"] = float(speeds.mean())
         
         return summary
     
@@ -437,14 +548,17 @@ class TelemetryProcessor:
             lap2_number: Specific lap number from session2 (uses fastest if None)
             
         Returns:
-            Aligned lap data suitable for frontend visualization
+            Aligned lap data suitable for frontend visualization; distance and
+            channels are numpy arrays, converted to lists only when the response
+            is serialized
         """
         try:
             result = self.alignment_engine.align_sessions(
                 session1, session2, 
                 use_fastest_laps=(lap1_number is None and lap2_number is None),
                 specific_lap1=lap1_number,
-                specific_lap2=lap2_number
+                specific_lap2=lap2_number,
+                as_lists=False
             )
             
             if not result.get("success"):
@@ -578,12 +692,15 @@ class TelemetryProcessor:
                     "error": "No valid lap found for analysis"
                 }
             
-            # Analyze driver actions
-            throttle_data = [point.throttle_pos for point in target_lap.data_points if point.throttle_pos is not None]
-            brake_data = [point.brake_pos for point in target_lap.data_points if point.brake_pos is not None]
+            # The lap's channel arrays serve both the action analysis and the
+            # statistics below
+            speeds = self._lap_values(target_lap, 'speed')
+            throttle_positions = self._lap_values(target_lap, 'throttle_pos')
+            brake_positions = self._lap_values(target_lap, 'brake_pos')
             
+            # Analyze driver actions
             action_analysis = self.comparison_engine.action_classifier.analyze_action_sequence(
-                throttle_data, brake_data
+                throttle_positions, brake_positions
             )
             
             # Analyze vehicle dynamics (basic analysis with available data)
@@ -591,10 +708,9 @@ class TelemetryProcessor:
                 target_lap.data_points
             )
             
-            # Calculate performance statistics
-            speeds = [point.speed for point in target_lap.data_points if point.speed is not None]
-            throttle_positions = [point.throttle_pos for point in target_lap.data_points if point.throttle_pos is not None]
-            brake_positions = [point.brake_pos for point in target_lap.data_points if point.brake_pos is not None]
+            has_speed = len(speeds) > 0
+            has_throttle = len(throttle_positions) > 0
+            has_brake = len(brake_positions) > 0
             
             return {
                 "success": True,
@@ -604,20 +720,20 @@ class TelemetryProcessor:
                 "is_fastest": target_lap.is_fastest,
                 "performance_metrics": {
                     "speed_stats": {
-                        "max_speed": max(speeds) if speeds else 0,
-                        "min_speed": min(speeds) if speeds else 0,
-                        "avg_speed": sum(speeds) / len(speeds) if speeds else 0,
-                        "speed_consistency": np.std(speeds) if speeds else 0
+                        "max_speed": float(speeds.max()) if has_speed else 0,
+                        "min_speed": float(speeds.min()) if has_speed else 0,
+                        "avg_speed": float(speeds.mean()) if has_speed else 0,
+                        "speed_consistency": float(speeds.std()) if has_speed else 0
                     },
                     "throttle_stats": {
-                        "max_throttle": max(throttle_positions) if throttle_positions else 0,
-                        "avg_throttle": sum(throttle_positions) / len(throttle_positions) if throttle_positions else 0,
-                        "throttle_application_count": len([t for t in throttle_positions if t > 95])
+                        "max_throttle": float(throttle_positions.max()) if has_throttle else 0,
+                        "avg_throttle": float(throttle_positions.mean()) if has_throttle else 0,
+                        "throttle_application_count": int(np.count_nonzero(throttle_positions > 95))
                     },
                     "brake_stats": {
-                        "max_brake": max(brake_positions) if brake_positions else 0,
-                        "avg_brake": sum(brake_positions) / len(brake_positions) if brake_positions else 0,
-                        "braking_events": len([b for b in brake_positions if b > 5])
+                        "max_brake": float(brake_positions.max()) if has_brake else 0,
+                        "avg_brake": float(brake_positions.mean()) if has_brake else 0,
+                        "braking_events": int(np.count_nonzero(brake_positions > 5))
                     }
                 },
                 "action_analysis": action_analysis,
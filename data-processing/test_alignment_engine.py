@@ -117,21 +117,21 @@ class TestDataAlignmentEngine(unittest.TestCase):
         aligned_points = self.alignment_engine._calculate_distance_alignment(lap)
         
         self.assertIsNotNone(aligned_points, "Alignment should not return None")
-        self.assertEqual(len(aligned_points), len(lap.data_points), 
+        self.assertEqual(len(aligned_points["distance"]), len(lap.data_points), 
                         "Should have same number of aligned points as original")
         
         # Check that distance is monotonically increasing
-        distances = [point["distance"] for point in aligned_points]
+        distances = aligned_points["distance"]
         for i in range(1, len(distances)):
             self.assertGreaterEqual(distances[i], distances[i-1], 
                                   "Distance should be monotonically increasing")
         
         # First point should be at distance 0
-        self.assertEqual(aligned_points[0]["distance"], 0.0, 
+        self.assertEqual(distances[0], 0.0, 
                         "First point should be at distance 0")
         
         # Last point should have positive distance
-        self.assertGreater(aligned_points[-1]["distance"], 0, 
+        self.assertGreater(distances[-1], 0, 
                           "Last point should have positive distance")
     
     def test_data_interpolation(self):
@@ -258,6 +258,24 @@ class TestDataAlignmentEngine(unittest.TestCase):
             self.assertIn("heavy_braking_percentage_driver1", braking)
             self.assertIn("heavy_braking_percentage_driver2", braking)
     
+    def test_batch_lap_alignment(self):
+        """Test aligning several lap pairings in one call"""
+        session1 = self.create_test_session("Driver A")
+        session2 = self.create_test_session("Driver B")
+        pairs = [(lap, session2.fastest_lap) for lap in session1.laps]
+        
+        results = self.alignment_engine.align_laps_batch(pairs)
+        
+        self.assertEqual(len(results), len(pairs), "Should return one result per pair")
+        for (lap1, lap2), result in zip(pairs, results):
+            self.assertTrue(result["success"], f"Batch alignment should succeed: {result.get('error', '')}")
+            
+            # Each pair should match aligning it on its own
+            single = DataAlignmentEngine().align_laps(lap1, lap2)
+            np.testing.assert_allclose(result["aligned_data"]["distance"], single["aligned_data"]["distance"])
+            np.testing.assert_allclose(result["aligned_data"]["driver1"]["speed"],
+                                       single["aligned_data"]["driver1"]["speed"])
+    
     def test_processor_integration(self):
         """Test integration with TelemetryProcessor"""
         session1 = self.create_test_session("Driver A")
@@ -0,0 +1,196 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.data_cleaner import DataCleaner
+from services.data_processor import TelemetryProcessor
+from models.telemetry_models import LapData, TelemetryDataPoint
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Abhay Mohan Round 3 Race 1 Telemetry.csv')
+
+def make_raw_frame(n: int = 200, offset: float = 0.0) -> pd.DataFrame:
+    """Build a raw telemetry frame with a gap and an outlier for the cleaner to fix"""
+    time = np.arange(n) * 0.05
+    speed = 100 + 20 * np.sin(time) + offset
+    speed[10] = np.nan
+    speed[50] = 999.0
+    return pd.DataFrame({
+        'Time': time,
+        'Speed': speed,
+        'Throttle Pos': np.linspace(0, 100, n),
+        'Distance on Vehicle Speed': np.arange(n) * 2.0,
+    })
+
+class TestCleanCache(unittest.TestCase):
+    """Test cases for DataCleaner.clean_data memoization"""
+
+    def setUp(self):
+        self.cleaner = DataCleaner()
+        self.raw = make_raw_frame()
+
+    def test_hit_equals_fresh_clean(self):
+        """A cache hit returns the same frame as cleaning without a key"""
+        expected = DataCleaner().clean_data(self.raw)
+
+        first = self.cleaner.clean_data(self.raw, cache_key="a")
+        second = self.cleaner.clean_data(self.raw, cache_key="a")
+
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+
+    def test_hit_skips_cleaning(self):
+        """A repeat key does not run the cleaning passes again"""
+        self.cleaner.clean_data(self.raw, cache_key="a")
+
+        with mock.patch.object(self.cleaner, '_clean', wraps=self.cleaner._clean) as clean:
+            self.cleaner.clean_data(self.raw, cache_key="a")
+            self.assertEqual(clean.call_count, 0)
+            self.cleaner.clean_data(self.raw, cache_key="b")
+            self.assertEqual(clean.call_count, 1)
+
+    def test_evicts_least_recently_used(self):
+        """Beyond clean_cache_size the least recently used key is dropped"""
+        self.cleaner.clean_cache_size = 2
+        self.cleaner.clean_data(self.raw, cache_key="k1")
+        self.cleaner.clean_data(self.raw, cache_key="k2")
+        self.cleaner.clean_data(self.raw, cache_key="k1")
+        self.cleaner.clean_data(self.raw, cache_key="k3")
+
+        self.assertEqual(list(self.cleaner._clean_cache), ["k1", "k3"])
+
+    def test_callers_cannot_corrupt_later_hits(self):
+        """Mutating a returned frame leaves the cached copy as it was"""
+        first = self.cleaner.clean_data(self.raw, cache_key="a")
+        expected = first.copy()
+
+        first.loc[:, 'Speed'] = -1.0
+        hit = self.cleaner.clean_data(self.raw, cache_key="a")
+        pd.testing.assert_frame_equal(hit, expected)
+
+        hit.drop(columns=['Speed'], inplace=True)
+        pd.testing.assert_frame_equal(self.cleaner.clean_data(self.raw, cache_key="a"), expected)
+
+@unittest.skipUnless(os.path.exists(SAMPLE_CSV), "sample telemetry file not available")
+class TestSessionCache(unittest.TestCase):
+    """Test cases for TelemetryProcessor._process_session memoization"""
+
+    @classmethod
+    def setUpClass(cls):
+        # The metadata header and first lap are enough to exercise the pipeline
+        cls.raw = pd.read_csv(SAMPLE_CSV, nrows=3000, low_memory=False)
+
+    def setUp(self):
+        self.processor = TelemetryProcessor()
+
+    def test_hit_equals_fresh_run(self):
+        """A cache hit returns the same results as an uncached run"""
+        metadata, df_clean, laps, fastest_lap = TelemetryProcessor()._process_session(self.raw)
+
+        self.processor._process_session(self.raw, "a")
+        hit = self.processor._process_session(self.raw, "a")
+
+        self.assertEqual(hit[0], metadata)
+        pd.testing.assert_frame_equal(hit[1], df_clean)
+        self.assertEqual([lap.model_dump() for lap in hit[2]], [lap.model_dump() for lap in laps])
+        self.assertEqual(hit[3].lap_number, fastest_lap.lap_number)
+
+    def test_hit_skips_pipeline(self):
+        """A repeat key does not extract or clean the upload again"""
+        self.processor._process_session(self.raw, "a")
+
+        with mock.patch.object(self.processor, '_extract_metadata') as extract:
+            self.processor._process_session(self.raw, "a")
+            extract.assert_not_called()
+
+    def test_evicts_least_recently_used(self):
+        """Beyond session_cache_size the least recently used key is dropped"""
+        self.processor.session_cache_size = 2
+        self.processor._process_session(self.raw, "k1")
+        self.processor._process_session(self.raw, "k2")
+        self.processor._process_session(self.raw, "k1")
+        self.processor._process_session(self.raw, "k3")
+
+        self.assertEqual(list(self.processor._session_cache), ["k1", "k3"])
+
+    def test_callers_cannot_corrupt_later_hits(self):
+        """Changes to returned metadata and frames do not reach later hits"""
+        metadata, df_clean, _, _ = self.processor._process_session(self.raw, "a")
+        expected_metadata = dict(metadata)
+        expected_frame = df_clean.copy()
+
+        metadata['laps_detected'] = 99
+        df_clean.loc[:, 'Speed'] = -1.0
+        hit_metadata, hit_frame, _, _ = self.processor._process_session(self.raw, "a")
+        self.assertEqual(hit_metadata, expected_metadata)
+        pd.testing.assert_frame_equal(hit_frame, expected_frame)
+
+        hit_frame.drop(columns=['Speed'], inplace=True)
+        pd.testing.assert_frame_equal(self.processor._process_session(self.raw, "a")[1], expected_frame)
+
+def make_lap(speeds, offset: float = 0.0) -> LapData:
+    """Build a lap with one point per speed value, 20 Hz apart"""
+    points = [TelemetryDataPoint(time=offset + i * 0.05, speed=speed, distance=i * 2.0)
+              for i, speed in enumerate(speeds)]
+    return LapData(lap_number=1, start_time=offset, end_time=offset + len(points) * 0.05,
+                   lap_time=len(points) * 0.05, data_points=points)
+
+class TestLapChannels(unittest.TestCase):
+    """Test cases for the per-lap channel arrays of LapData.channel"""
+
+    def test_hit_returns_same_array(self):
+        """A repeat lookup returns the array built on first use"""
+        lap = make_lap([100.0, 105.3, 110.0])
+        speed = lap.channel('speed')
+
+        self.assertIs(lap.channel('speed'), speed)
+        np.testing.assert_array_equal(speed, [100.0, 105.3, 110.0])
+        self.assertEqual(speed.dtype, np.float64)
+
+    def test_missing_values_are_nan(self):
+        """Points without a value show up as NaN"""
+        lap = make_lap([100.0, None, 110.0])
+
+        np.testing.assert_array_equal(lap.channel('speed'), [100.0, np.nan, 110.0])
+        self.assertTrue(np.isnan(lap.channel('gear')).all())
+
+    def test_arrays_are_read_only(self):
+        """Callers cannot write into an array that later lookups share"""
+        lap = make_lap([100.0, 105.3, 110.0])
+
+        with self.assertRaises(ValueError):
+            lap.channel('speed')[0] = -1.0
+        np.testing.assert_array_equal(lap.channel('speed'), [100.0, 105.3, 110.0])
+
+    def test_rebuilds_after_data_points_replaced(self):
+        """Assigning new data_points invalidates the cached arrays"""
+        lap = make_lap([100.0, 105.3, 110.0])
+        lap.channel('speed')
+
+        lap.data_points = make_lap([90.0, 95.0]).data_points
+        np.testing.assert_array_equal(lap.channel('speed'), [90.0, 95.0])
+
+    def test_rebuilds_after_length_change(self):
+        """Appending to data_points in place invalidates the cached arrays"""
+        lap = make_lap([100.0, 105.3, 110.0])
+        lap.channel('speed')
+
+        lap.data_points.append(TelemetryDataPoint(time=0.15, speed=120.0))
+        np.testing.assert_array_equal(lap.channel('speed'), [100.0, 105.3, 110.0, 120.0])
+
+    def test_not_serialized(self):
+        """The cached arrays are not part of the lap's fields"""
+        lap = make_lap([100.0, 105.3])
+        expected = lap.model_dump()
+        lap.channel('speed')
+
+        self.assertEqual(lap.model_dump(), expected)
+        self.assertNotIn('_channels', lap.model_dump_json())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -147,6 +147,25 @@ def test_driver_action_classifier():
     print(f"  Dominant action: {analysis['dominant_action']}")
     print(f"  Total transitions: {analysis['total_transitions']}")
 
+def test_action_sequence_unequal_lengths():
+    """Test that throttle and brake channels of different lengths are paired like zip()"""
+    print("\nTesting Action Sequence With Unequal Channels...")
+    
+    classifier = DriverActionClassifier()
+    
+    # Laps drop missing samples per channel, so brake can be shorter than throttle
+    throttle_data = [100, 90, 80, 30, 0, 0, 20, 60, 100]
+    brake_data = [0, 0, 5, 20, 50, 30]
+    
+    analysis = classifier.analyze_action_sequence(throttle_data, brake_data)
+    expected = classifier.analyze_action_sequence(throttle_data[:len(brake_data)], brake_data)
+    swapped = classifier.analyze_action_sequence(throttle_data[:4], brake_data)
+    
+    assert analysis == expected, "Unequal channels should be truncated to the shorter one"
+    assert abs(sum(swapped['action_distribution'].values()) - 100) < 1e-9
+    print(f"  ✅ Paired {len(brake_data)} points, {analysis['total_transitions']} transitions")
+    return True
+
 def test_vehicle_dynamics_analyzer():
     """Test vehicle dynamics analysis"""
     print("\nTesting Vehicle Dynamics Analyzer...")
@@ -252,6 +271,7 @@ async def run_all_tests():
     
     tests = [
         test_driver_action_classifier,
+        test_action_sequence_unequal_lengths,
         test_vehicle_dynamics_analyzer,
         test_track_sector_analyzer,
         test_performance_metrics,
@@ -0,0 +1,285 @@
+import unittest
+import asyncio
+import io
+import json
+import sys
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from routers import telemetry
+from routers.telemetry import (
+    _ChunkReader, _stream_csv_upload, _check_json_payload, _stream_json,
+    _pipeline_usecols, _read_pipeline_csv, _get_cached_alignment, _store_alignment
+)
+from models.telemetry_models import SessionData, LapData, TelemetryDataPoint
+from services.data_cleaner import widen_float32
+
+SAMPLE_CSV = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Abhay Mohan Round 3 Race 1 Telemetry.csv')
+BOUNDARY = "testboundary"
+CSV_TEXT = "Time,Speed\n0.0,10.5\n0.05,11.0\n0.1,11.5\n"
+
+def multipart_body(filename: str = "lap.csv", csv_text: str = CSV_TEXT, session_id: str = "s1") -> bytes:
+    """Build a multipart/form-data body with a session_id field and one file part"""
+    return (
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="session_id"\r\n\r\n'
+        f"{session_id}\r\n"
+        f"--{BOUNDARY}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f"Content-Type: text/csv\r\n\r\n"
+        f"{csv_text}\r\n"
+        f"--{BOUNDARY}--\r\n"
+    ).encode("utf-8")
+
+def make_request(body: bytes, chunk_size: int = 16) -> Request:
+    """Request whose body arrives in small chunks, as from a slow client"""
+    chunks = [body[i:i + chunk_size] for i in range(0, len(body), chunk_size)] or [b""]
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/telemetry/process",
+        "query_string": b"",
+        "headers": [(b"content-type", f"multipart/form-data; boundary={BOUNDARY}".encode())],
+    }
+    return Request(scope, receive)
+
+def make_session(driver_name: str, base_speed: float, n_points: int = 400) -> SessionData:
+    """Session with one synthetic lap"""
+    points = [
+        TelemetryDataPoint(
+            time=i * 0.05,
+            speed=base_speed + 20 * np.sin(i / 40),
+            throttle_pos=float(60 + 40 * np.cos(i / 30)),
+            brake_pos=float(max(0.0, -30 * np.cos(i / 30))),
+            gear=3 + i // 150,
+            rpm=6000.0 + i
+        )
+        for i in range(n_points)
+    ]
+    lap = LapData(lap_number=1, start_time=0.0, end_time=points[-1].time,
+                  lap_time=points[-1].time, data_points=points, is_fastest=True)
+    return SessionData(driver_name=driver_name, laps=[lap], fastest_lap=lap)
+
+def plain(value):
+    """The payload as plain JSON values: numpy arrays as lists (float32 rounded, as the routes write it) and scalars"""
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return widen_float32(value).tolist()
+    if isinstance(value, np.generic):
+        return widen_float32(np.asarray(value)).item()
+    return value
+
+class TestStreamCsvUpload(unittest.TestCase):
+    """Test cases for parsing multipart uploads off the request stream"""
+
+    def test_multipart_upload(self):
+        """The file part is parsed into a DataFrame and form fields are returned"""
+        filename, fields, df = asyncio.run(_stream_csv_upload(make_request(multipart_body())))
+
+        self.assertEqual(filename, "lap.csv")
+        self.assertEqual(fields, {"session_id": "s1"})
+        pd.testing.assert_frame_equal(df, pd.read_csv(io.StringIO(CSV_TEXT)))
+
+    def test_upload_larger_than_queue(self):
+        """Uploads with more chunks than the reader holds still parse completely"""
+        rows = "".join(f"{i * 0.05:.2f},{100 + i % 50}.5\n" for i in range(5000))
+        csv_text = "Time,Speed\n" + rows
+
+        filename, fields, df = asyncio.run(
+            _stream_csv_upload(make_request(multipart_body(csv_text=csv_text), chunk_size=64))
+        )
+        self.assertEqual(len(df), 5000)
+        self.assertAlmostEqual(df["Speed"].iloc[-1], 149.5)
+
+    def test_parse_error_does_not_stall_upload(self):
+        """A parser that fails early stops taking data instead of blocking the receive"""
+        rows = "".join(f"{i * 0.05:.2f},{100 + i % 50}.5\n" for i in range(5000))
+        csv_text = "Time,Speed\n0.0,1.0\n0.05,1.0,2.0,3.0\n" + rows
+
+        with self.assertRaises(pd.errors.ParserError):
+            asyncio.run(asyncio.wait_for(
+                _stream_csv_upload(make_request(multipart_body(csv_text=csv_text), chunk_size=64)),
+                timeout=30
+            ))
+
+    def test_non_csv_filename(self):
+        """Files without a .csv name are rejected with a 400"""
+        with self.assertRaises(HTTPException) as context:
+            asyncio.run(_stream_csv_upload(make_request(multipart_body(filename="lap.txt"))))
+        self.assertEqual(context.exception.status_code, 400)
+
+    def test_truncated_body(self):
+        """A body that ends inside the file part is a 400, not a partial frame"""
+        body = multipart_body()
+        truncated = body[:body.index(b"0.05,11.0") + 4]
+
+        with self.assertRaises(HTTPException) as context:
+            asyncio.run(_stream_csv_upload(make_request(truncated)))
+        self.assertEqual(context.exception.status_code, 400)
+
+    def test_reader_is_bounded(self):
+        """A full reader refuses more chunks until the parser reads, and drops them once released"""
+        reader = _ChunkReader(max_chunks=2)
+        self.assertTrue(reader.feed_nowait(b"a,b\n"))
+        self.assertTrue(reader.feed_nowait(b"1,2\n"))
+        self.assertFalse(reader.feed_nowait(b"3,4\n"))
+
+        reader.release()
+        self.assertTrue(reader.feed_nowait(b"3,4\n"))
+
+    def test_process_documents_form_fields(self):
+        """The /process OpenAPI schema still lists the file and session_id fields"""
+        app = FastAPI()
+        app.include_router(telemetry.router)
+
+        body = app.openapi()["paths"]["/telemetry/process"]["post"]["requestBody"]
+        schema = body["content"]["multipart/form-data"]["schema"]
+        self.assertEqual(set(schema["properties"]), {"file", "session_id"})
+
+class TestStreamJson(unittest.TestCase):
+    """Test cases for the streamed JSON responses"""
+
+    def test_matches_json_response(self):
+        """The streamed body is the same JSON JSONResponse produced for the list payload"""
+        result = telemetry.processor.get_lap_comparison_data(make_session("A", 120.0), make_session("B", 118.0))
+        self.assertTrue(result["success"], result.get("error"))
+
+        _check_json_payload(result)
+        streamed = b"".join(_stream_json(result))
+        self.assertEqual(streamed, JSONResponse(content=plain(result)).body)
+        self.assertEqual(json.loads(streamed), plain(result))
+
+    def test_large_payload_in_chunks(self):
+        """Payloads bigger than one chunk are split but reassemble to the full body"""
+        payload = {"distance": np.arange(50000) * 10.0, "gear": np.ones(50000, dtype=np.int64), "name": "Ä"}
+
+        chunks = list(_stream_json(payload))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(b"".join(chunks), JSONResponse(content=plain(payload)).body)
+
+    def test_float32_written_as_decimals(self):
+        """Float32 channels are written as the values they store, without binary noise"""
+        payload = {"speed": np.array([105.3, 0.1, -7.25], dtype=np.float32), "top": np.float32(213.7)}
+
+        self.assertEqual(b"".join(_stream_json(payload)), b'{"speed":[105.3,0.1,-7.25],"top":213.7}')
+
+    def test_rejects_nan_before_streaming(self):
+        """NaN anywhere in the payload is found before the response starts"""
+        with self.assertRaises(ValueError):
+            _check_json_payload({"a": [1.0, {"b": float("nan")}]})
+        with self.assertRaises(ValueError):
+            _check_json_payload({"channels": {"speed": np.array([1.0, np.nan], dtype=np.float32)}})
+        with self.assertRaises(ValueError):
+            _check_json_payload({"delta": np.float64("inf")})
+
+    def test_rejects_unsupported_types(self):
+        """Values the encoder cannot serialize are found before the response starts"""
+        with self.assertRaises(TypeError):
+            _check_json_payload({"a": [object()]})
+        with self.assertRaises(TypeError):
+            _check_json_payload({("a", "b"): 1})
+
+class TestAlignmentCache(unittest.TestCase):
+    """Test cases for the /lap-delta alignment cache"""
+
+    def setUp(self):
+        telemetry._align_cache.clear()
+        self.result = telemetry.processor.alignment_engine.align_sessions(
+            make_session("A", 120.0), make_session("B", 118.0)
+        )
+        self.assertTrue(self.result["success"], self.result.get("error"))
+
+    def tearDown(self):
+        telemetry._align_cache.clear()
+
+    def test_hit_returns_equal_result(self):
+        """A stored alignment comes back equal, and a miss returns None"""
+        _store_alignment(("a", "b", None, None), self.result)
+
+        self.assertEqual(_get_cached_alignment(("a", "b", None, None)), self.result)
+        self.assertIsNone(_get_cached_alignment(("a", "b", 1, None)))
+
+    def test_evicts_least_recently_used(self):
+        """Beyond the size limit the least recently used entry is dropped"""
+        with mock.patch.object(telemetry, '_ALIGN_CACHE_SIZE', 2):
+            _store_alignment(("k1",), self.result)
+            _store_alignment(("k2",), self.result)
+            _get_cached_alignment(("k1",))
+            _store_alignment(("k3",), self.result)
+
+        self.assertIsNotNone(_get_cached_alignment(("k1",)))
+        self.assertIsNone(_get_cached_alignment(("k2",)))
+        self.assertIsNotNone(_get_cached_alignment(("k3",)))
+
+    def test_callers_cannot_corrupt_later_hits(self):
+        """Changing a stored or returned result leaves the cached entry as it was"""
+        expected = json.loads(json.dumps(self.result))
+        _store_alignment(("a",), self.result)
+        self.result["aligned_data"]["driver1"]["speed"][0] = -1.0
+
+        hit = _get_cached_alignment(("a",))
+        hit["comparison_metrics"].clear()
+        hit["aligned_data"]["distance"].append(1e9)
+
+        self.assertEqual(_get_cached_alignment(("a",)), expected)
+
+@unittest.skipUnless(os.path.exists(SAMPLE_CSV), "sample AiM export not available")
+class TestPipelineColumns(unittest.TestCase):
+    """Test cases for reading only the pipeline columns of an AiM export"""
+
+    def test_sample_file_matches_full_read(self):
+        """Metadata, laps and cleaned channels are the same as from reading every column"""
+        with open(SAMPLE_CSV, 'rb') as file_obj:
+            df_subset = _read_pipeline_csv(file_obj)
+        df_full = pd.read_csv(SAMPLE_CSV)
+        self.assertLess(df_subset.shape[1], df_full.shape[1])
+
+        processor = telemetry.TelemetryProcessor()
+        metadata1, clean1, laps1, fastest1 = processor._process_session(df_subset)
+        metadata2, clean2, laps2, fastest2 = processor._process_session(df_full)
+
+        self.assertEqual(metadata1, metadata2)
+        self.assertGreater(len(laps1), 0)
+        self.assertEqual(laps1, laps2)
+        self.assertEqual(fastest1, fastest2)
+        pd.testing.assert_frame_equal(clean1, clean2[clean1.columns])
+
+    def test_falls_back_when_header_disagrees(self):
+        """Positions that do not line up with the parsed header read every column"""
+        full = pd.read_csv(SAMPLE_CSV)
+        with open(SAMPLE_CSV, 'rb') as file_obj:
+            usecols, expected = _pipeline_usecols(file_obj)
+            shifted = [col + 1 for col in usecols if col + 1 < full.shape[1]]
+            out_of_range = usecols + [full.shape[1] + 5]
+            for positions in (shifted, out_of_range):
+                with mock.patch.object(telemetry, '_pipeline_usecols', return_value=(positions, expected)):
+                    df = _read_pipeline_csv(file_obj)
+                self.assertTrue(df.equals(full))
+
+    def test_unreadable_header_scan_reads_everything(self):
+        """Lines the csv module rejects give no positions instead of an error"""
+        usecols, expected = _pipeline_usecols(io.BytesIO(b"Format,AiM\rCSV\nTime,GPS Speed,a,b,c,d\n"))
+        self.assertIsNone(usecols)
+        self.assertEqual(expected, [])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)